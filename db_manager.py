@@ -1,80 +1,556 @@
 import duckdb
 import argparse
+import asyncio
+import atexit
+import math
 import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from tabulate import tabulate
 
+from salary import parse_salary_text, EMPTY as EMPTY_SALARY
+from text_norm import fold
+
 # Config
 BASE_DIR = Path(__file__).parent
 MAIN_DB = os.path.join(BASE_DIR, 'job_crusher.duckdb')
 CACHE_DB = os.path.join(BASE_DIR, 'scan_cache.duckdb')
 
-def get_conn(db_name='main'):
+# Jedno połączenie na bazę na proces; wywołujący dostają kursory
+_CONNECTIONS = {}
+_CONN_LOCK = threading.Lock()
+
+def _create_sequences(conn):
+    for table in ('companies', 'offers'):
+        start = conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+        conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {table}_id_seq START {start}")
+
+# Migracje schematu - wersja = pozycja na liście (od 1). Tylko dopisujemy na końcu!
+MIGRATIONS = [
+    # 1: schemat bazowy
+    """
+    CREATE TABLE IF NOT EXISTS companies (
+        id INTEGER PRIMARY KEY,
+        name VARCHAR UNIQUE,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS offers (
+        id INTEGER PRIMARY KEY,
+        company_id INTEGER,
+        title VARCHAR,
+        location VARCHAR,
+        source_url VARCHAR UNIQUE,
+        status VARCHAR DEFAULT 'Lead',
+        note TEXT,
+        full_text TEXT,
+        score INTEGER,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (company_id) REFERENCES companies(id)
+    );
+    """,
+    # 2: znacznik odświeżenia oferty (--refresh-older-than)
+    "ALTER TABLE offers ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;",
+    # 3: sekwencje id zamiast MAX(id)+1
+    _create_sequences,
+    # 4: znormalizowane wynagrodzenie (salary.py) + indeks pod --min-salary
+    """
+    ALTER TABLE offers ADD COLUMN IF NOT EXISTS salary_min DOUBLE;
+    ALTER TABLE offers ADD COLUMN IF NOT EXISTS salary_max DOUBLE;
+    ALTER TABLE offers ADD COLUMN IF NOT EXISTS salary_currency VARCHAR;
+    ALTER TABLE offers ADD COLUMN IF NOT EXISTS salary_period VARCHAR;
+    ALTER TABLE offers ADD COLUMN IF NOT EXISTS salary_monthly_pln INTEGER;
+    CREATE INDEX IF NOT EXISTS idx_offers_salary ON offers (salary_monthly_pln);
+    """,
+    # 5: prawie-duplikaty (near_dup.py): sygnatury MinHash, kubełki LSH, link do oferty kanonicznej
+    """
+    ALTER TABLE offers ADD COLUMN IF NOT EXISTS canonical_id INTEGER;
+    CREATE TABLE IF NOT EXISTS offer_minhash (
+        source_url VARCHAR PRIMARY KEY,
+        canonical_url VARCHAR,
+        signature UINTEGER[]
+    );
+    CREATE TABLE IF NOT EXISTS offer_lsh (
+        band SMALLINT,
+        bucket BIGINT,
+        source_url VARCHAR
+    );
+    CREATE INDEX IF NOT EXISTS idx_offer_lsh ON offer_lsh (band, bucket);
+    """,
+    # 6: wyniki wszystkich profili scoringu (scoring.ProfileScorer); offers.score = najlepszy
+    """
+    CREATE TABLE IF NOT EXISTS offer_profile_scores (
+        offer_id INTEGER,
+        profile VARCHAR,
+        score INTEGER,
+        PRIMARY KEY (offer_id, profile)
+    );
+    """,
+    # 7: podobieństwo TF-IDF do CV (tfidf.py): słownik z DF, licznik ofert, wynik oferty
+    """
+    ALTER TABLE offers ADD COLUMN IF NOT EXISTS cv_similarity DOUBLE;
+    CREATE TABLE IF NOT EXISTS tfidf_vocab (
+        term VARCHAR PRIMARY KEY,
+        term_id INTEGER,
+        df INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS tfidf_meta (
+        id INTEGER PRIMARY KEY,
+        n_docs INTEGER,
+        max_offer_id INTEGER
+    );
+    """,
+    # 8: tokeny TF-IDF po text_norm.fold (bez polskich znaków) - słownik liczony od nowa przy następnym runie
+    "DELETE FROM tfidf_vocab; DELETE FROM tfidf_meta;",
+    # 9: wyszukiwanie pełnotekstowe (--search): tytuł + treść po text_norm.fold, pod indeks FTS (BM25)
+    """
+    CREATE TABLE IF NOT EXISTS offer_search (
+        id INTEGER PRIMARY KEY,
+        title VARCHAR,
+        body VARCHAR,
+        indexed_at TIMESTAMP
+    );
+    """,
+]
+
+def _db_path(db_name):
     if db_name == 'main':
-        db_path = MAIN_DB
-    else:
-        db_path = os.path.join(BASE_DIR, f'{db_name}.duckdb')
+        return MAIN_DB
+    return os.path.join(BASE_DIR, f'{db_name}.duckdb')
+
+def _migrate(conn):
+    """Uruchamia brakujące migracje (raz na otwarcie bazy)"""
+    conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER, applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    current = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
     
-    conn = duckdb.connect(db_path)
+    for version, migration in enumerate(MIGRATIONS, 1):
+        if version <= current:
+            continue
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            if callable(migration):
+                migration(conn)
+            else:
+                conn.execute(migration)
+            conn.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+def _connect(db_name):
+    with _CONN_LOCK:
+        conn = _CONNECTIONS.get(db_name)
+        if conn is None:
+            conn = duckdb.connect(_db_path(db_name))
+            _migrate(conn)
+            _CONNECTIONS[db_name] = conn
+        return conn
+
+def get_conn(db_name='main'):
+    """Kursor na współdzielonym połączeniu (`with get_conn() as conn:` zamyka tylko kursor)"""
+    return _connect(db_name).cursor()
+
+@atexit.register
+def close_all():
+    with _CONN_LOCK:
+        for conn in _CONNECTIONS.values():
+            conn.close()
+        _CONNECTIONS.clear()
+
+# Kolumny przyjmowane przez add_offers_bulk (url = source_url)
+OFFER_FIELDS = ('company', 'title', 'location', 'url', 'status', 'full_text', 'score')
+SALARY_FIELDS = tuple(EMPTY_SALARY)
+
+# Cache nazwa firmy -> id, osobno dla każdej bazy
+_COMPANY_IDS = {}
+
+def _cell(value):
+    """Brak w komórce DataFrame (NaN) -> None, żeby zadziałały domyślne wartości pól"""
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+def _offer_records(offers) -> list:
+    """Lista dictów z listy / pandas DataFrame / pyarrow Table"""
+    if hasattr(offers, 'to_pylist'):
+        offers = offers.to_pylist()
+    elif hasattr(offers, 'to_dict') and hasattr(offers, 'columns'):
+        offers = offers.to_dict('records')
     
+    # Ostatni wpis wygrywa - ON CONFLICT nie może aktualizować tego samego wiersza dwa razy
+    by_url = {}
+    for o in offers:
+        o = {k: _cell(v) for k, v in o.items()}
+        rec = {k: o.get(k) for k in OFFER_FIELDS}
+        rec['company'] = rec['company'] or 'Unknown'
+        rec['status'] = rec['status'] or 'New'
+        rec['score'] = int(rec['score'] or 0)
+        # Pensja normalizowana raz przy zapisie: gotowe pola salary_* albo surowy tekst 'salary'
+        if o.get('salary_period'):
+            rec.update({k: o.get(k) for k in SALARY_FIELDS})
+        else:
+            rec.update(parse_salary_text(o.get('salary')))
+        # W bazie brak pensji = NULL (nie 0), żeby ponowny zapis bez pensji nie kasował znanej
+        rec['salary_monthly_pln'] = rec['salary_monthly_pln'] or None
+        rec['canonical_url'] = o.get('canonical_url')
+        rec['profile_scores'] = o.get('profile_scores') or {}
+        rec['cv_similarity'] = o.get('cv_similarity')
+        by_url[rec['url']] = rec
+    return list(by_url.values())
+
+def _resolve_companies(conn, db, names) -> dict:
+    """Id firm - z cache procesu, brakujące wstawiane/wyszukiwane jednym zapytaniem"""
+    cache = _COMPANY_IDS.setdefault(db, {})
+    ids = {n: cache[n] for n in names if n in cache}
+    missing = [n for n in names if n not in cache]
+    if missing:
+        conn.execute("""
+            INSERT INTO companies (id, name)
+            SELECT nextval('companies_id_seq'), n FROM (SELECT DISTINCT unnest(?::VARCHAR[]) AS n)
+            ON CONFLICT (name) DO NOTHING
+        """, (missing,))
+        ids.update(conn.execute("SELECT name, id FROM companies WHERE name IN (SELECT unnest(?::VARCHAR[]))", (missing,)).fetchall())
+    return ids
+
+def _set_canonical(conn, links):
+    """links: [(source_url, canonical_url)] -> offers.canonical_id = id oferty kanonicznej"""
+    if not links:
+        return
     conn.execute("""
-        CREATE TABLE IF NOT EXISTS companies (
-            id INTEGER PRIMARY KEY,
-            name VARCHAR UNIQUE,
-            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        CREATE TABLE IF NOT EXISTS offers (
-            id INTEGER PRIMARY KEY,
-            company_id INTEGER,
-            title VARCHAR,
-            location VARCHAR,
-            source_url VARCHAR UNIQUE,
-            status VARCHAR DEFAULT 'Lead',
-            note TEXT,
-            full_text TEXT,
-            score INTEGER,
-            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (company_id) REFERENCES companies(id)
-        );
-    """)
-    return conn
-
-def add_offer(company_name, title, location, url, status='New', full_text=None, score=0, db='main'):
+        UPDATE offers SET canonical_id = c.id
+        FROM (SELECT unnest(?::VARCHAR[]) AS url, unnest(?::VARCHAR[]) AS canonical_url) d
+        JOIN offers c ON c.source_url = d.canonical_url
+        WHERE offers.source_url = d.url
+    """, ([u for u, _ in links], [c for _, c in links]))
+
+def set_canonical(links, db='main'):
     with get_conn(db) as conn:
-        # Generowanie ID dla firmy
-        conn.execute("INSERT INTO companies (id, name) SELECT COALESCE(MAX(id), 0) + 1, ? FROM companies WHERE NOT EXISTS (SELECT 1 FROM companies WHERE name = ?)", (company_name, company_name))
-        comp_id = conn.execute("SELECT id FROM companies WHERE name = ?", (company_name,)).fetchone()[0]
-        
-        # Generowanie ID dla oferty
-        next_id_offer = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM offers").fetchone()[0]
-        
-        # Insert or update
-        existing = conn.execute("SELECT id FROM offers WHERE source_url = ?", (url,)).fetchone()
-        
-        if existing:
-            conn.execute("""
-                UPDATE offers SET 
-                    full_text = ?,
-                    score = ?
-                WHERE source_url = ?
-            """, (full_text, score, url))
-        else:
+        _set_canonical(conn, links)
+
+def save_profile_scores(rows, db='main'):
+    """rows: [(offer_id, profil, wynik)] -> offer_profile_scores (nadpisuje poprzednie wyniki profilu)"""
+    if not rows:
+        return
+    with get_conn(db) as conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO offer_profile_scores
+            SELECT unnest(?::INTEGER[]), unnest(?::VARCHAR[]), unnest(?::INTEGER[])
+        """, ([r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows]))
+
+def add_offers_bulk(offers, db='main') -> int:
+    """
+    Zapis wielu ofert w jednej transakcji: firmy rozwiązywane hurtowo, oferty przez
+    INSERT ... ON CONFLICT (source_url) - istniejące dostają nowy full_text i score;
+    pola salary_* podmieniane razem (jedno parsowanie), tylko gdy nowy zapis ma pensję.
+    offers: lista dictów (OFFER_FIELDS + 'salary' albo pola salary_*), pandas DataFrame albo pyarrow Table.
+    Opcjonalne 'canonical_url' (prawie-duplikat) ustawia canonical_id na id tamtej oferty.
+    Opcjonalne 'profile_scores' ({profil: wynik}) trafia do offer_profile_scores,
+    'cv_similarity' (TF-IDF, %) do offers.cv_similarity.
+    """
+    records = _offer_records(offers)
+    if not records:
+        return 0
+    
+    with get_conn(db) as conn:
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            comp_ids = _resolve_companies(conn, db, {r['company'] for r in records})
+            cols = {k: [r[k] for r in records] for k in OFFER_FIELDS + SALARY_FIELDS + ('cv_similarity',)}
+            cols['company_id'] = [comp_ids[c] for c in cols['company']]
             conn.execute("""
-                INSERT INTO offers (id, company_id, title, location, source_url, status, full_text, score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (next_id_offer, comp_id, title, location, url, status, full_text, score))
+                INSERT INTO offers (id, company_id, title, location, source_url, status, full_text, score,
+                                    salary_min, salary_max, salary_currency, salary_period, salary_monthly_pln, cv_similarity)
+                SELECT nextval('offers_id_seq'), * FROM (
+                    SELECT unnest(?::INTEGER[]), unnest(?::VARCHAR[]), unnest(?::VARCHAR[]), unnest(?::VARCHAR[]),
+                           unnest(?::VARCHAR[]), unnest(?::VARCHAR[]), unnest(?::INTEGER[]),
+                           unnest(?::DOUBLE[]), unnest(?::DOUBLE[]), unnest(?::VARCHAR[]), unnest(?::VARCHAR[]), unnest(?::INTEGER[]),
+                           unnest(?::DOUBLE[])
+                )
+                ON CONFLICT (source_url) DO UPDATE SET
+                    full_text = excluded.full_text,
+                    score = excluded.score,
+                    salary_min = CASE WHEN excluded.salary_period IS NOT NULL THEN excluded.salary_min ELSE offers.salary_min END,
+                    salary_max = CASE WHEN excluded.salary_period IS NOT NULL THEN excluded.salary_max ELSE offers.salary_max END,
+                    salary_currency = CASE WHEN excluded.salary_period IS NOT NULL THEN excluded.salary_currency ELSE offers.salary_currency END,
+                    salary_period = CASE WHEN excluded.salary_period IS NOT NULL THEN excluded.salary_period ELSE offers.salary_period END,
+                    salary_monthly_pln = CASE WHEN excluded.salary_period IS NOT NULL THEN excluded.salary_monthly_pln ELSE offers.salary_monthly_pln END,
+                    cv_similarity = COALESCE(excluded.cv_similarity, offers.cv_similarity),
+                    updated_at = now()::TIMESTAMP
+            """, (cols['company_id'], cols['title'], cols['location'], cols['url'],
+                  cols['status'], cols['full_text'], cols['score'],
+                  cols['salary_min'], cols['salary_max'], cols['salary_currency'],
+                  cols['salary_period'], cols['salary_monthly_pln'], cols['cv_similarity']))
+            _set_canonical(conn, [(r['url'], r['canonical_url']) for r in records if r['canonical_url']])
+            scores = [(r['url'], p, s) for r in records for p, s in r['profile_scores'].items()]
+            if scores:
+                conn.execute("""
+                    INSERT OR REPLACE INTO offer_profile_scores
+                    SELECT o.id, d.profile, d.score
+                    FROM (SELECT unnest(?::VARCHAR[]) AS url, unnest(?::VARCHAR[]) AS profile, unnest(?::INTEGER[]) AS score) d
+                    JOIN offers o ON o.source_url = d.url
+                """, ([r[0] for r in scores], [r[1] for r in scores], [r[2] for r in scores]))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    # Cache dopiero po commicie - rollback nie zostawi w nim nieistniejących id
+    _COMPANY_IDS[db].update(comp_ids)
+    return len(records)
+
+def add_offer(company_name, title, location, url, status='New', full_text=None, score=0, db='main', salary=None):
+    """salary: tekst widełek albo gotowy dict z salary.parse_salary_*"""
+    offer = {
+        'company': company_name, 'title': title, 'location': location, 'url': url,
+        'status': status, 'full_text': full_text, 'score': score,
+    }
+    if isinstance(salary, dict):
+        offer.update(salary)
+    else:
+        offer['salary'] = salary
+    add_offers_bulk([offer], db=db)
+    print(f"✅ Saved to {db}: {title} at {company_name}")
+
+def update_offer(offer_id, status=None, note=None, db='main'):
+    """Zmiana statusu i/lub notatki oferty (pominięte pola bez zmian)"""
+    with get_conn(db) as conn:
+        conn.execute("""
+            UPDATE offers SET
+                status = COALESCE(?, status),
+                note = COALESCE(?, note),
+                updated_at = now()::TIMESTAMP
+            WHERE id = ?
+        """, (status, note, offer_id))
+
+class OfferWriter:
+    """
+    Jedyny wątek piszący do bazy (group commit): oferty z kolejki zbierane w paczki
+    i zapisywane add_offers_bulk, gdy paczka ma batch_size ofert albo minie flush_interval_sec.
+    Pełna kolejka (max_pending) wstrzymuje producenta zamiast rosnąć w pamięci.
+    """
+    _STOP = object()
+
+    def __init__(self, db='main', batch_size=50, flush_interval_sec=2.0, max_pending=500):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval_sec = flush_interval_sec
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.thread = threading.Thread(target=self._run, name=f'offer-writer-{db}', daemon=True)
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.backpressure_waits = 0
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def put(self, offer: dict):
+        self.queue.put(offer)
+
+    async def put_async(self, offer: dict):
+        """Nie blokuje pętli asyncio; przy pełnej kolejce czeka w executorze"""
+        try:
+            self.queue.put_nowait(offer)
+        except queue.Full:
+            self.backpressure_waits += 1
+            await asyncio.get_running_loop().run_in_executor(None, self.queue.put, offer)
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if not batch else max(0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
             
-        print(f"✅ Saved to {db}: {title} at {company_name}")
+            if item is self._STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval_sec
+                batch.append(item)
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        try:
+            self.written += add_offers_bulk(batch, db=self.db)
+            self.batches += 1
+            print(f"   💾 Committed {len(batch)} offers to {self.db}")
+        except Exception as e:
+            self.errors += 1
+            print(f"   ❌ Write error ({len(batch)} offers lost): {e}")
+
+    def close(self):
+        """Zapisuje resztę kolejki i kończy wątek"""
+        if self.thread.is_alive():
+            self.queue.put(self._STOP)
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+def get_known_urls(db='main', older_than_days=None) -> set:
+    """
+    Zbiór source_url zapisanych w bazie - jedno zapytanie na start runu.
+    older_than_days: oferty pobrane/odświeżone dawniej niż N dni temu nie są zwracane (do ponownego pobrania).
+    """
+    with get_conn(db) as conn:
+        if older_than_days is None:
+            rows = conn.execute("SELECT source_url FROM offers").fetchall()
+        else:
+            cutoff = datetime.now() - timedelta(days=older_than_days)
+            rows = conn.execute("""
+                SELECT source_url FROM offers
+                WHERE COALESCE(updated_at, added_at) >= ?
+            """, (cutoff,)).fetchall()
+    return {r[0] for r in rows}
 
-def list_offers(db='main', limit=20):
+def list_offers(db='main', limit=20, min_salary=None):
+    """min_salary: tylko oferty z miesięcznym PLN >= progu (filtr w SQL na salary_monthly_pln)"""
+    where, params = "", []
+    if min_salary is not None:
+        where = "WHERE o.salary_monthly_pln >= ?"
+        params.append(min_salary)
     with get_conn(db) as conn:
-        data = conn.execute("""
-            SELECT o.id, c.name, o.title, o.score, o.status, CAST(o.added_at AS DATE)
+        data = conn.execute(f"""
+            SELECT o.id, c.name, o.title, o.score, o.salary_monthly_pln, o.status, CAST(o.added_at AS DATE)
             FROM offers o JOIN companies c ON o.company_id = c.id
+            {where}
             ORDER BY o.added_at DESC LIMIT ?
-        """, (limit,)).fetchall()
+        """, (*params, limit)).fetchall()
         print(f"\n--- OFFERS IN {db.upper()} ---")
-        print(tabulate(data, headers=["ID", "Company", "Title", "Score", "Status", "Date"]))
+        print(tabulate(data, headers=["ID", "Company", "Title", "Score", "PLN/mies.", "Status", "Date"]))
+
+# ===== WYSZUKIWANIE (DuckDB FTS) =====
+
+def _load_fts(conn, install=True) -> bool:
+    """Rozszerzenie fts (install=True: pierwszy raz pobierane przez INSTALL); False = niedostępne (np. offline)"""
+    try:
+        conn.execute("LOAD fts")
+    except duckdb.Error as e:
+        if not install:
+            print(f"⚠️ DuckDB FTS extension not loaded: {e}")
+            return False
+        try:
+            conn.execute("INSTALL fts")
+            conn.execute("LOAD fts")
+        except duckdb.Error as e:
+            print(f"⚠️ DuckDB FTS extension unavailable: {e}")
+            return False
+    return True
+
+def _stale_search_rows(conn) -> list:
+    """[(id, znacznik zmiany)] ofert dodanych/zmienionych od ostatniego odświeżenia offer_search"""
+    return conn.execute("""
+        SELECT o.id, COALESCE(o.updated_at, o.added_at) FROM offers o
+        LEFT JOIN offer_search s ON s.id = o.id
+        WHERE s.id IS NULL OR COALESCE(o.updated_at, o.added_at) > s.indexed_at
+    """).fetchall()
+
+def _has_search_index(conn) -> bool:
+    return conn.execute(
+        "SELECT COUNT(*) FROM information_schema.schemata WHERE schema_name = 'fts_main_offer_search'"
+    ).fetchone()[0] > 0
+
+def refresh_search_index(db='main', force=False) -> int | None:
+    """
+    Indeks FTS nad offer_search - kopią tytułu i treści po fold() (DuckDB FTS nie składa 'ł').
+    Kopia aktualizowana przyrostowo: tylko oferty dodane/zmienione od poprzedniego razu
+    (COALESCE(updated_at, added_at) > indexed_at). Indeksu FTS nie da się uzupełniać,
+    więc jest przebudowywany - ale tylko gdy coś się zmieniło.
+    Wywoływane po zapisie (koniec runu v2/v3) i przez --reindex - nie przy wyszukiwaniu.
+    Zwraca liczbę przeindeksowanych ofert albo None bez rozszerzenia fts.
+    """
+    with get_conn(db) as conn:
+        if not _load_fts(conn):
+            return None
+        changed = _stale_search_rows(conn)
+        if not changed and _has_search_index(conn) and not force:
+            return 0
+        
+        if changed:
+            ids = [r[0] for r in changed]
+            rows = conn.execute(
+                "SELECT id, title, full_text FROM offers WHERE id IN (SELECT unnest(?::INTEGER[]))", (ids,)
+            ).fetchall()
+            indexed_at = dict(changed)
+            conn.execute("""
+                INSERT OR REPLACE INTO offer_search
+                SELECT unnest(?::INTEGER[]), unnest(?::VARCHAR[]), unnest(?::VARCHAR[]), unnest(?::TIMESTAMP[])
+            """, ([r[0] for r in rows], [fold(r[1]) for r in rows], [fold(r[2]) for r in rows],
+                  [indexed_at[r[0]] for r in rows]))
+        conn.execute("PRAGMA create_fts_index('offer_search', 'id', 'title', 'body', overwrite=1)")
+    return len(changed)
+
+def _snippet(text, terms, width=80) -> str:
+    """Fragment treści wokół pierwszego trafienia słowa z zapytania (trafienie w **...**)"""
+    text = " ".join((text or '').split())
+    folded = fold(text)
+    # fold() zwykle nie zmienia długości - wtedy wycinek z oryginału (z polskimi znakami)
+    source = text if len(folded) == len(text) else folded
+    # Początek wyrazu - słowo z zapytania albo jego odmiana (BM25 też dopasowuje rdzeń)
+    hit = re.search(r'\b(' + '|'.join(re.escape(t) for t in terms if t) + r')', folded) if any(terms) else None
+    if not hit:
+        return source[:width * 2] + ("…" if len(source) > width * 2 else "")
+    pos, end_hit = hit.span()
+    start, end = max(0, pos - width), min(len(source), end_hit + width)
+    return (("…" if start else "") + source[start:pos] + "**" + source[pos:end_hit] + "**"
+            + source[end_hit:end] + ("…" if end < len(source) else ""))
+
+def search_index_stale(db='main') -> int:
+    """Liczba ofert zmienionych od ostatniego odświeżenia indeksu (tylko odczyt)"""
+    with get_conn(db) as conn:
+        return len(_stale_search_rows(conn))
+
+def search_offers(query, db='main', limit=20) -> list:
+    """
+    Ranking BM25 po tytule i treści (bez prawie-duplikatów): [(id, firma, tytuł, score, status, bm25, fragment)].
+    Tylko odczyt istniejącego indeksu - budowany tu wyłącznie, gdy jeszcze go nie ma (pierwsze wyszukiwanie).
+    """
+    with get_conn(db) as conn:
+        has_index = _has_search_index(conn)
+    if not has_index:
+        if refresh_search_index(db) is None:
+            return []
+    with get_conn(db) as conn:
+        if has_index and not _load_fts(conn, install=False):
+            return []
+        rows = conn.execute("""
+            SELECT o.id, c.name, o.title, o.score, o.status, s.rank, o.full_text FROM (
+                SELECT id, fts_main_offer_search.match_bm25(id, ?) AS rank FROM offer_search
+            ) s
+            JOIN offers o ON o.id = s.id
+            LEFT JOIN companies c ON o.company_id = c.id
+            WHERE s.rank IS NOT NULL AND o.canonical_id IS NULL
+            ORDER BY s.rank DESC LIMIT ?
+        """, (fold(query), limit)).fetchall()
+    terms = fold(query).split()
+    return [(*r[:5], round(r[5], 2), _snippet(r[6], terms)) for r in rows]
+
+def print_search(query, db='main', limit=20):
+    start = time.perf_counter()
+    results = search_offers(query, db, limit)
+    ms = (time.perf_counter() - start) * 1000
+    print(f"\n--- SEARCH '{query}' IN {db.upper()}: {len(results)} offers ({ms:.0f} ms) ---")
+    stale = search_index_stale(db)
+    if stale:
+        print(f"⚠️ Search index is stale: {stale} offers added/changed since the last refresh (run --reindex)")
+    for offer_id, company, title, score, status, rank, snippet in results:
+        print(f"\n[{offer_id}] {title} | {company} | score {score} | {status} | BM25 {rank}")
+        print(f"   {snippet}")
 
 def get_offer_text(offer_id, db='main'):
     with get_conn(db) as conn:
@@ -90,10 +566,20 @@ if __name__ == "__main__":
     parser.add_argument('--list', action='store_true', help='List recent offers')
     parser.add_argument('--get_text', type=int, help='Get full text of offer by ID')
     parser.add_argument('--db', default='main', help='Database to use (main or scan_cache)')
+    parser.add_argument('--min-salary', type=int, help='With --list: only offers paying at least N PLN/month')
+    parser.add_argument('--limit', type=int, default=20, help='With --list/--search: number of offers to show')
+    parser.add_argument('--search', help='Full-text search over title and offer text (BM25), e.g. "power bi category"')
+    parser.add_argument('--reindex', action='store_true', help='Rebuild the full-text search index')
     
     args = parser.parse_args()
     
     if args.list: 
-        list_offers(args.db)
+        list_offers(args.db, limit=args.limit, min_salary=args.min_salary)
+    elif args.search:
+        print_search(args.search, args.db, limit=args.limit)
+    elif args.reindex:
+        n = refresh_search_index(args.db, force=True)
+        if n is not None:
+            print(f"✅ Search index rebuilt ({n} offers re-indexed)")
     elif args.get_text:
         get_offer_text(args.get_text, args.db)
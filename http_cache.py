@@ -0,0 +1,117 @@
+"""
+Cache odpowiedzi HTTP na dysku (DuckDB)
+
+Strony listy i szczegóły ofert trzymane skompresowane (zlib) z czasem pobrania.
+Każdy typ strony ma własny TTL; po przekroczeniu limitu rozmiaru usuwane są
+najdawniej używane wpisy (LRU).
+"""
+
+import json
+import zlib
+from datetime import datetime, timedelta
+
+import duckdb
+
+
+class ResponseCache:
+    """Cache kluczowany URL-em; page_type: 'list' albo 'detail'"""
+
+    def __init__(self, db_path, ttl_hours: dict, max_mb: float = 200):
+        self.ttl = {k: timedelta(hours=v) for k, v in ttl_hours.items()}
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+        self.conn = duckdb.connect(str(db_path))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url VARCHAR PRIMARY KEY,
+                page_type VARCHAR,
+                status INTEGER,
+                body BLOB,
+                size INTEGER,
+                fetched_at TIMESTAMP,
+                last_access TIMESTAMP
+            )
+        """)
+        self._total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url: str, page_type: str) -> bytes | None:
+        """Treść odpowiedzi albo None (brak / przeterminowana)"""
+        cutoff = datetime.now() - self.ttl[page_type]
+        row = self.conn.execute(
+            "SELECT body FROM responses WHERE url = ? AND fetched_at >= ?", (url, cutoff)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (datetime.now(), url))
+        return zlib.decompress(row[0])
+
+    def put(self, url: str, page_type: str, body: bytes, status: int = 200):
+        blob = zlib.compress(body, 6)
+        now = datetime.now()
+        old = self.conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, page_type, status, blob, len(blob), now, now),
+        )
+        self._total += len(blob) - (old[0] if old else 0)
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def get_json(self, url: str, page_type: str):
+        body = self.get(url, page_type)
+        return json.loads(body) if body is not None else None
+
+    def put_json(self, url: str, page_type: str, data):
+        self.put(url, page_type, json.dumps(data, ensure_ascii=False, default=str).encode('utf-8'))
+
+    def _evict(self):
+        """LRU: usuwa najdawniej używane wpisy aż do 90% limitu"""
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute("SELECT url, size FROM responses ORDER BY last_access").fetchall()
+        drop = []
+        for url, size in rows:
+            if self._total <= target:
+                break
+            drop.append(url)
+            self._total -= size
+        if drop:
+            self.conn.executemany("DELETE FROM responses WHERE url = ?", [(u,) for u in drop])
+            self.evicted += len(drop)
+
+    def summary(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evicted': self.evicted,
+            'size_mb': round(self._total / 1024 / 1024, 1),
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+class CachedResponse:
+    """Minimalny odpowiednik curl_cffi Response dla trafień w cache"""
+
+    def __init__(self, url: str, content: bytes, status_code: int = 200):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+        self.encoding = 'utf-8'
+        self.ok = True
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        pass
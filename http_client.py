@@ -0,0 +1,130 @@
+"""
+Warstwa HTTP dla scrapera Pracuj.pl
+
+create_session - jedna pula połączeń (keep-alive, HTTP/2) na cały run.
+ThrottledSession - opakowanie AsyncSession: najpierw pamięć stron zapytania i cache na dysku, potem limiter;
+odpowiedź jest klasyfikowana (zdrowa / blokada) i raportowana do limitera.
+fetch_offer_details - get_offer_details na współdzielonej sesji.
+"""
+
+import asyncio
+import contextlib
+import inspect
+from urllib.parse import urlencode, urlsplit
+
+from curl_cffi.requests import AsyncSession
+
+from Pracuj_pl_Scraper.get_offer_details import get_offer_details
+from http_cache import ResponseCache, CachedResponse
+from rate_limiter import AdaptiveRateLimiter, classify_response
+
+DETAILS_ACCEPTS_CLIENT = 'client' in inspect.signature(get_offer_details).parameters
+DETAILS_FALLBACK_NOTE = "get_offer_details() has no `client` parameter - every detail page opens its own session (no shared pool)"
+
+
+def create_session(pool_size: int = 10, connect_timeout: float = 10, read_timeout: float = 30,
+                   impersonate: str = 'chrome', http_version: str = 'v2') -> AsyncSession:
+    """Sesja współdzielona przez listę i szczegóły - handshake TLS tylko raz na połączenie z puli"""
+    if not DETAILS_ACCEPTS_CLIENT:
+        print(f"⚠️ {DETAILS_FALLBACK_NOTE}")
+    return AsyncSession(
+        max_clients=pool_size,
+        timeout=(connect_timeout, read_timeout),
+        impersonate=impersonate,
+        http_version=http_version,
+    )
+
+
+def session_from_settings(settings: dict) -> AsyncSession:
+    return create_session(
+        pool_size=settings['http_pool_size'],
+        connect_timeout=settings['http_connect_timeout_sec'],
+        read_timeout=settings['http_read_timeout_sec'],
+        impersonate=settings['http_impersonate'],
+        http_version=settings['http_version'],
+    )
+
+
+def page_type(url: str) -> str:
+    return 'detail' if ',oferta,' in url else 'list'
+
+
+def request_key(url: str, params=None) -> str:
+    """URL razem z parametrami zapytania (np. numer strony) - klucz pamięci stron i cache na dysku"""
+    if not params:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(params, doseq=True)}"
+
+
+async def fetch_offer_details(session, url: str) -> dict:
+    """
+    Pobiera szczegóły oferty przez przekazaną sesję.
+    Starsze wersje get_offer_details(url) bez parametru `client` otwierają własną sesję
+    (create_session i podsumowanie runu ostrzegają o tym przez DETAILS_FALLBACK_NOTE).
+    """
+    if DETAILS_ACCEPTS_CLIENT:
+        return await get_offer_details(url, client=session)
+    return await get_offer_details(url)
+
+
+class ThrottledSession:
+    """Przekazywany do scrape_keyword zamiast gołego AsyncSession"""
+
+    def __init__(self, session, limiter: AdaptiveRateLimiter, cache: ResponseCache = None, max_per_host: int = None):
+        """max_per_host: limit równoległych requestów do jednego hosta (None = bez limitu)"""
+        self.session = session
+        self.limiter = limiter
+        self.cache = cache
+        self.max_per_host = max_per_host
+        self._host_slots = {}
+        # Strony listy jednego zapytania (tylko w kopii z for_query) - ponowne scrape_keyword
+        # z większym max_pages ich nie powtarza; None = bez pamięci
+        self._pages = None
+
+    def for_query(self) -> 'ThrottledSession':
+        """Kopia na czas paginacji jednego zapytania: wspólne sesja, limiter, cache i limity hostów, własna pamięć stron"""
+        view = ThrottledSession(self.session, self.limiter, self.cache, self.max_per_host)
+        view._host_slots = self._host_slots
+        view._pages = {}
+        return view
+
+    async def get(self, url, **kwargs):
+        key = request_key(url, kwargs.get('params'))
+        if self._pages is not None and key in self._pages:
+            return CachedResponse(url, self._pages[key])
+        
+        # Trafienie w cache nie zużywa budżetu limitera
+        if self.cache:
+            body = self.cache.get(key, page_type(url))
+            if body is not None:
+                self._remember(key, url, body)
+                return CachedResponse(url, body)
+        
+        async with self._slot(url):
+            await self.limiter.acquire()
+            resp = await self.session.get(url, **kwargs)
+        reason = classify_response(resp.status_code, resp.text)
+        if reason:
+            self.limiter.record_block(reason)
+        else:
+            self.limiter.record_success()
+            if resp.status_code == 200:
+                self._remember(key, url, resp.content)
+            if self.cache and resp.status_code == 200:
+                self.cache.put(key, page_type(url), resp.content)
+        return resp
+
+    def _remember(self, key, url: str, body: bytes):
+        if self._pages is not None and page_type(url) == 'list':
+            self._pages[key] = body
+
+    def _slot(self, url: str):
+        if not self.max_per_host:
+            return contextlib.nullcontext()
+        host = urlsplit(url).hostname or ''
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_slots[host]
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
@@ -20,9 +20,9 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'Pracuj-pl-Scraper'))
 sys.path.insert(0, os.path.dirname(__file__))
 
 from scraper import PracujScraper
-from get_offer_details import get_offer_details
 from db_manager import add_offer, update_offer, get_conn
-from curl_cffi.requests import AsyncSession
+from http_client import create_session, fetch_offer_details
+from salary import parse_salary_text
 
 
 # ===== KONFIGURACJA =====
@@ -96,17 +96,8 @@ def check_position_level(title: str, position_levels: list) -> bool:
 
 
 def extract_salary(salary_str: str) -> int:
-    """Wyciąga wartość wynagrodzenia z tekstu"""
-    if not salary_str or salary_str == "Nie podano":
-        return 0
-    
-    # Szukaj liczb w tekście
-    import re
-    numbers = re.findall(r'\d+[\s\d]*', salary_str.replace(' ', ''))
-    if numbers:
-        # Bierz pierwszą liczbę (od)
-        return int(numbers[0].replace(' ', ''))
-    return 0
+    """Wyciąga wartość wynagrodzenia z tekstu (miesięczne PLN, "od" widełek)"""
+    return parse_salary_text(salary_str)['salary_monthly_pln']
 
 
 def calculate_cv_match(details: dict) -> dict:
@@ -282,14 +273,16 @@ async def job_hunter():
     scraper = PracujScraper()
     all_offers = []
     
+    # Jedna sesja (pula keep-alive) na listę i szczegóły
+    client = create_session()
+    
     # 1. Scraping ofert
     print(f"\n📡 Scraping ofert dla keywords: {SEARCH_KEYWORDS}")
-    async with AsyncSession() as client:
-        tasks = [scraper.scrape_keyword(client, kw, max_pages=1) for kw in SEARCH_KEYWORDS]
-        results = await asyncio.gather(*tasks)
-        
-        for r in results:
-            all_offers.extend(r)
+    tasks = [scraper.scrape_keyword(client, kw, max_pages=1) for kw in SEARCH_KEYWORDS]
+    results = await asyncio.gather(*tasks)
+    
+    for r in results:
+        all_offers.extend(r)
     
     print(f"✅ Znaleziono {len(all_offers)} ofert (przed filtrowaniem)")
     print(f"⚠️ TRYB TESTOWY: Ograniczam do pierwszych 10 ofert\n")
@@ -310,7 +303,7 @@ async def job_hunter():
         
         # Pobierz szczegóły
         try:
-            details = await get_offer_details(offer['Link'])
+            details = await fetch_offer_details(client, offer['Link'])
             
             if 'error' in details:
                 print(f"   ⚠️ Błąd: {details.get('error', 'Unknown')}")
@@ -352,6 +345,7 @@ async def job_hunter():
             'match': match_result
         })
     
+    await client.close()
     print(f"✅ Po filtrowaniu: {len(filtered_offers)} ofert\n")
     
     # 3. Sortuj według score
@@ -375,7 +369,8 @@ async def job_hunter():
             details['title'],
             details['location'],
             details['url'],
-            match['status']
+            match['status'],
+            salary=details.get('salary')
         )
         
         # Pobierz ID oferty
@@ -9,19 +9,30 @@ Workflow:
 3. Scoring dopasowania do CV (0-100%)
 4. Dodanie do bazy Job Crusher
 5. Utworzenie katalogu dla ofert >70%
+
+Indeed/JobSpy jest też źródłem w job_hunter_v3 (sekcja `sources.jobspy` w config.yaml) -
+tam z filtrami i scoringiem z config.yaml, w jednym runie z Pracuj.pl.
 """
 
 import sys
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 import re
 
+import numpy as np
+import pandas as pd
+
 # Dodaj ścieżki do importów
 sys.path.insert(0, os.path.dirname(__file__))
 
 from jobspy import scrape_jobs
-from db_manager import add_offer, update_offer, get_conn
+from db_manager import add_offer, update_offer, get_conn, refresh_search_index
+from salary import parse_salary_fields, monthly_factor, jobspy_period_currency
+from text_norm import field_text, fold, normalized
 
 
 # ===== KONFIGURACJA =====
@@ -41,6 +52,14 @@ LOCATIONS = [
     "Poland",
 ]
 
+# Serwisy JobSpy - tylko Indeed (bez rate limitingu), LinkedIn wymaga proxy
+SITES = ["indeed"]
+
+# Równoległy scraping: wątki na kombinacje (fraza × lokalizacja × serwis)
+SCRAPE_WORKERS = 6
+SITE_CONCURRENCY = {'indeed': 6, 'linkedin': 1, 'glassdoor': 2}  # max wywołań naraz na serwis
+DEFAULT_SITE_CONCURRENCY = 2
+
 # Hard filters
 ALLOWED_WORK_MODES = [
     "remote", "hybrid", "warszawa", "warsaw"
@@ -57,22 +76,33 @@ EXCLUDED_TITLES = [
 MIN_SALARY_PLN = 12000  # PLN brutto/mies
 MIN_SALARY_USD_YEARLY = 50000  # USD/rok
 
+LOCATION_KEYWORDS = ['warszawa', 'warsaw', 'poland', 'polska']
+
+# Scoring CV: (kategoria, słowa kluczowe, punkty za trafienie, max punktów, ile pierwszych słów punktuje)
+# None = punktuje każde słowo z listy (English: dowolne trafienie = 10 pkt)
+SCORING_CATEGORIES = [
+    ('FMCG', ["fmcg", "fast moving", "consumer goods", "spożywcze", "kosmetyki", "chemia gospodarcza"], 15, 30, 2),
+    ('Retail', ["retail", "e-commerce", "sprzedaż detaliczna", "sieci handlowe", "marketplace"], 12, 25, 2),
+    ('Team Management', ["team management", "people management", "zarządzanie zespołem", "budowanie zespołu", "lider", "zespół"], 10, 20, 2),
+    ('Analytics', ["data analysis", "analytics", "excel", "power bi", "sql", "raportowanie", "analityczne"], 7, 15, 2),
+    ('English', ["english", "angielski", "b2", "c1", "fluent"], 10, 10, None),
+]
+
 
 # ===== FUNKCJE POMOCNICZE =====
 
 def check_location(job_data: dict) -> bool:
     """Sprawdza czy lokalizacja spełnia kryteria"""
-    location = str(job_data.get('location', '')).lower()
-    city = str(job_data.get('city', '')).lower()
-    state = str(job_data.get('state', '')).lower()
-    is_remote = job_data.get('is_remote', False)
+    job = normalized(job_data)
+    is_remote = job.get('is_remote', False)
     
     # Praca zdalna
     if is_remote:
         return True
     
-    # Warszawa lub Polska
-    if any(loc in location or loc in city or loc in state for loc in ['warszawa', 'warsaw', 'poland', 'polska']):
+    # Warszawa lub Polska (bez polskich znaków - text_norm.fold)
+    fields = [job.folded(col) for col in ('location', 'city', 'state')]
+    if any(fold(loc) in value for loc in LOCATION_KEYWORDS for value in fields):
         return True
     
     return False
@@ -80,46 +110,31 @@ def check_location(job_data: dict) -> bool:
 
 def check_position_level(title: str) -> bool:
     """Sprawdza czy poziom stanowiska jest odpowiedni"""
-    title_lower = title.lower()
+    title_folded = fold(field_text(title))
     
     # Wykluczenia
     for excluded in EXCLUDED_TITLES:
-        if excluded in title_lower:
+        if fold(excluded) in title_folded:
             return False
     
     # Wymagane poziomy
-    if any(req in title_lower for req in REQUIRED_LEVELS):
+    if any(fold(req) in title_folded for req in REQUIRED_LEVELS):
         return True
     
     return False
 
 
+def extract_salary_fields(job_data: dict) -> dict:
+    """Znormalizowane wynagrodzenie (salary.py) z pól JobSpy"""
+    return parse_salary_fields(
+        job_data.get('min_amount'), job_data.get('max_amount'),
+        job_data.get('interval'), job_data.get('currency'),
+    )
+
+
 def extract_salary_pln(job_data: dict) -> int:
-    """Wyciąga wartość wynagrodzenia w PLN"""
-    min_amount = job_data.get('min_amount')
-    max_amount = job_data.get('max_amount')
-    interval = job_data.get('interval', '').lower()
-    
-    if not min_amount and not max_amount:
-        return 0
-    
-    # Bierz min_amount jeśli dostępne, inaczej max_amount
-    amount = min_amount if min_amount else max_amount
-    
-    # Konwersja do miesięcznego PLN
-    if interval == 'yearly':
-        # Zakładamy USD -> PLN (4.0) i dzielimy przez 12
-        amount_pln = (amount * 4.0) / 12
-    elif interval == 'monthly':
-        # Już miesięcznie, zakładamy PLN
-        amount_pln = amount
-    elif interval == 'hourly':
-        # Godzinowo -> miesięcznie (160h/mies)
-        amount_pln = amount * 160
-    else:
-        amount_pln = amount
-    
-    return int(amount_pln)
+    """Wyciąga wartość wynagrodzenia w PLN (miesięcznie)"""
+    return extract_salary_fields(job_data)['salary_monthly_pln']
 
 
 def calculate_cv_match(job_data: dict) -> dict:
@@ -132,56 +147,15 @@ def calculate_cv_match(job_data: dict) -> dict:
     score = 0
     breakdown = {}
     
-    # Przygotuj tekst do analizy
-    text_to_analyze = " ".join([
-        str(job_data.get('title', '')),
-        str(job_data.get('description', '')),
-        str(job_data.get('company', '')),
-    ]).lower()
-    
-    # 1. FMCG (30 pkt)
-    fmcg_keywords = ["fmcg", "fast moving", "consumer goods", "spożywcze", "kosmetyki", "chemia gospodarcza"]
-    fmcg_score = sum(15 if kw in text_to_analyze else 0 for kw in fmcg_keywords[:2])
-    breakdown['FMCG'] = min(fmcg_score, 30)
-    score += breakdown['FMCG']
-    
-    # 2. Retail (25 pkt)
-    retail_keywords = ["retail", "e-commerce", "sprzedaż detaliczna", "sieci handlowe", "marketplace"]
-    retail_score = sum(12 if kw in text_to_analyze else 0 for kw in retail_keywords[:2])
-    breakdown['Retail'] = min(retail_score, 25)
-    score += breakdown['Retail']
-    
-    # 3. Zarządzanie zespołem (20 pkt)
-    team_keywords = ["team management", "people management", "zarządzanie zespołem", "budowanie zespołu", "lider", "zespół"]
-    team_score = sum(10 if kw in text_to_analyze else 0 for kw in team_keywords[:2])
-    breakdown['Team Management'] = min(team_score, 20)
-    score += breakdown['Team Management']
-    
-    # 4. Analityka (15 pkt)
-    analytics_keywords = ["data analysis", "analytics", "excel", "power bi", "sql", "raportowanie", "analityczne"]
-    analytics_score = sum(7 if kw in text_to_analyze else 0 for kw in analytics_keywords[:2])
-    breakdown['Analytics'] = min(analytics_score, 15)
-    score += breakdown['Analytics']
-    
-    # 5. Język angielski (10 pkt)
-    english_keywords = ["english", "angielski", "b2", "c1", "fluent"]
-    english_score = 10 if any(kw in text_to_analyze for kw in english_keywords) else 0
-    breakdown['English'] = english_score
-    score += breakdown['English']
-    
-    # Verdict
-    if score >= 90:
-        verdict = "🔥 MUST APPLY"
-        status = "Lead"
-    elif score >= 70:
-        verdict = "✅ STRONG MATCH"
-        status = "Lead"
-    elif score >= 50:
-        verdict = "⚠️ MAYBE"
-        status = "poczekalnia"
-    else:
-        verdict = "❌ REJECT"
-        status = "Rejected"
+    # Przygotuj tekst do analizy (zapamiętany w NormalizedOffer)
+    text_to_analyze = normalized(job_data).folded('title', 'description', 'company')
+    
+    for category, keywords, points, cap, scored in SCORING_CATEGORIES:
+        hits = sum(1 for kw in keywords[:scored] if fold(kw) in text_to_analyze)
+        breakdown[category] = min(hits * points, cap)
+        score += breakdown[category]
+    
+    verdict, status = get_verdict(score)
     
     return {
         'score': score,
@@ -191,6 +165,91 @@ def calculate_cv_match(job_data: dict) -> dict:
     }
 
 
+def get_verdict(score: int) -> tuple:
+    """Werdykt i status w bazie dla wyniku scoringu"""
+    if score >= 90:
+        return "🔥 MUST APPLY", "Lead"
+    elif score >= 70:
+        return "✅ STRONG MATCH", "Lead"
+    elif score >= 50:
+        return "⚠️ MAYBE", "poczekalnia"
+    return "❌ REJECT", "Rejected"
+
+
+def _folded_col(df: pd.DataFrame, col: str) -> pd.Series:
+    """Kolumna po text_norm.fold (lower-case, bez polskich znaków); brak wartości = pusty tekst"""
+    if col not in df:
+        return pd.Series('', index=df.index)
+    # pandas 3: astype(str) zostawia NaN - konkatenacja i fold() muszą dostać tekst
+    return df[col].fillna('').astype(str).map(fold)
+
+
+def _contains_any(series: pd.Series, keywords: list) -> pd.Series:
+    mask = pd.Series(False, index=series.index)
+    for kw in keywords:
+        mask |= series.str.contains(fold(kw), regex=False)
+    return mask
+
+
+def score_jobs_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Batch scoring całego DataFrame z JobSpy: twarde filtry, pensja i scoring CV
+    liczone operacjami kolumnowymi (te same reguły co check_* / extract_salary_pln / calculate_cv_match).
+    
+    Returns:
+        DataFrame (ten sam index): location_ok, level_ok, salary_pln, salary_ok,
+        punkty per kategoria, score, verdict, status, passed
+    """
+    out = pd.DataFrame(index=df.index)
+    
+    # 1. Lokalizacja
+    is_remote = df['is_remote'].fillna(False).astype(bool) if 'is_remote' in df else False
+    location_ok = pd.Series(False, index=df.index)
+    for col in ('location', 'city', 'state'):
+        location_ok |= _contains_any(_folded_col(df, col), LOCATION_KEYWORDS)
+    out['location_ok'] = location_ok | is_remote
+    
+    # 2. Poziom stanowiska
+    title = _folded_col(df, 'title')
+    out['level_ok'] = ~_contains_any(title, EXCLUDED_TITLES) & _contains_any(title, REQUIRED_LEVELS)
+    
+    # 3. Wynagrodzenie -> miesięczne PLN (mnożnik z salary.py liczony raz na parę interval/waluta)
+    min_amount = pd.to_numeric(df['min_amount'], errors='coerce') if 'min_amount' in df else pd.Series(np.nan, index=df.index)
+    max_amount = pd.to_numeric(df['max_amount'], errors='coerce') if 'max_amount' in df else pd.Series(np.nan, index=df.index)
+    amount = min_amount.where(min_amount > 0, max_amount).fillna(0)
+    # Brak wartości = None (NaN != NaN - krotki z NaN nie byłyby unikalnymi kluczami mapy)
+    interval = df['interval'].astype(object).where(df['interval'].notna(), None) if 'interval' in df else [None] * len(df)
+    currency = df['currency'].astype(object).where(df['currency'].notna(), None) if 'currency' in df else [None] * len(df)
+    pairs = pd.Series(list(zip(interval, currency)), index=df.index)
+    factor = pairs.map({p: monthly_factor(*jobspy_period_currency(*p)) for p in set(pairs)})
+    out['salary_pln'] = (amount * factor).round(2).astype(int)
+    out['salary_ok'] = ~((out['salary_pln'] > 0) & (out['salary_pln'] < MIN_SALARY_PLN))
+    
+    # 4. Scoring: macierz trafień (oferty × słowa) @ macierz punktów (słowa × kategorie)
+    text = title + " " + _folded_col(df, 'description') + " " + _folded_col(df, 'company')
+    keywords = [fold(kw) for _, kws, _, _, scored in SCORING_CATEGORIES for kw in kws[:scored]]
+    hits = np.column_stack([text.str.contains(kw, regex=False).to_numpy() for kw in keywords]).astype(np.int32)
+    
+    points = np.zeros((len(keywords), len(SCORING_CATEGORIES)), dtype=np.int32)
+    row = 0
+    for col, (_, kws, pts, _, scored) in enumerate(SCORING_CATEGORIES):
+        n = len(kws[:scored])
+        points[row:row + n, col] = pts
+        row += n
+    caps = np.array([cap for _, _, _, cap, _ in SCORING_CATEGORIES], dtype=np.int32)
+    
+    category_scores = np.minimum(hits @ points, caps)
+    for col, (category, *_) in enumerate(SCORING_CATEGORIES):
+        out[category] = category_scores[:, col]
+    out['score'] = category_scores.sum(axis=1)
+    
+    verdicts = out['score'].map(get_verdict)
+    out['verdict'] = verdicts.str[0]
+    out['status'] = verdicts.str[1]
+    out['passed'] = out['location_ok'] & out['level_ok'] & out['salary_ok'] & (out['score'] >= 50)
+    return out
+
+
 def create_offer_folder(job_data: dict, match_result: dict):
     """Tworzy katalog dla oferty z plikami"""
     company = str(job_data.get('company', 'Unknown')).replace('/', '-').replace('\\', '-')
@@ -278,6 +337,72 @@ def create_offer_folder(job_data: dict, match_result: dict):
     return folder_path
 
 
+# ===== SCRAPING (WĄTKI) =====
+
+def scrape_combination(search_term: str, location: str, site: str, site_slots: dict) -> tuple:
+    """Jedno blokujące wywołanie scrape_jobs; (DataFrame albo None, czas w s, błąd albo None)"""
+    with site_slots[site]:
+        start = time.monotonic()
+        try:
+            jobs = scrape_jobs(
+                site_name=[site],
+                search_term=search_term,
+                location=location,
+                results_wanted=50,  # Więcej wyników z Indeed
+                is_remote=True,
+                country_indeed='Poland',
+            )
+            return jobs, time.monotonic() - start, None
+        except Exception as e:
+            return None, time.monotonic() - start, str(e)
+
+
+def scrape_all(search_terms: list, locations: list, sites: list) -> tuple:
+    """
+    Wszystkie kombinacje na puli SCRAPE_WORKERS wątków, z limitem wywołań naraz na serwis.
+    Wyniki deduplikowane po job_url od razu po każdym wywołaniu.
+    Zwraca (DataFrame unikalnych ofert albo None, statystyki per kombinacja).
+    """
+    site_slots = {site: threading.Semaphore(SITE_CONCURRENCY.get(site, DEFAULT_SITE_CONCURRENCY)) for site in sites}
+    combos = [(term, loc, site) for term in search_terms for loc in locations for site in sites]
+    seen_urls = set()
+    frames = []
+    timings = []
+    
+    with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as pool:
+        futures = {pool.submit(scrape_combination, *combo, site_slots): combo for combo in combos}
+        for future in as_completed(futures):
+            term, loc, site = futures[future]
+            jobs, sec, error = future.result()
+            found = new = 0
+            if jobs is not None and len(jobs) > 0:
+                found = len(jobs)
+                jobs = jobs.drop_duplicates(subset=['job_url'], keep='first')
+                jobs = jobs[~jobs['job_url'].isin(seen_urls)]
+                seen_urls.update(jobs['job_url'])
+                new = len(jobs)
+                if new: frames.append(jobs)
+            
+            if error:
+                print(f"   ❌ '{term}' w '{loc}' [{site}]: {error} ({sec:.1f}s)")
+            elif found:
+                print(f"   ✅ '{term}' w '{loc}' [{site}]: {found} ofert, {new} nowych ({sec:.1f}s)")
+            else:
+                print(f"   ⚠️ '{term}' w '{loc}' [{site}]: brak wyników ({sec:.1f}s)")
+            timings.append({'term': term, 'location': loc, 'site': site, 'sec': sec, 'found': found, 'new': new, 'error': error})
+    
+    df = pd.concat(frames, ignore_index=True) if frames else None
+    return df, timings
+
+
+def print_scrape_stats(timings: list, wall_sec: float):
+    errors = [t for t in timings if t['error']]
+    slowest = max(timings, key=lambda t: t['sec'], default=None)
+    print(f"\n⏱️ Scraping: {len(timings)} wywołań w {wall_sec:.1f}s (suma czasów: {sum(t['sec'] for t in timings):.1f}s), błędy: {len(errors)}")
+    if slowest:
+        print(f"   Najwolniejsze: '{slowest['term']}' w '{slowest['location']}' [{slowest['site']}] - {slowest['sec']:.1f}s")
+
+
 # ===== GŁÓWNA FUNKCJA =====
 
 def job_hunter():
@@ -286,85 +411,43 @@ def job_hunter():
     print("🔍 JOB HUNTER v2.0 - JobSpy Edition")
     print("=" * 100)
     
-    all_jobs = []
-    
     # 1. Scraping ofert z JobSpy
     print(f"\n📡 Scraping ofert z Indeed (LinkedIn wymaga proxy)...")
     print(f"Keywords: {SEARCH_TERMS}")
-    print(f"Lokalizacje: {LOCATIONS}\n")
+    print(f"Lokalizacje: {LOCATIONS}")
+    print(f"Wątki: {SCRAPE_WORKERS}, serwisy: {SITES}\n")
     
-    for search_term in SEARCH_TERMS:
-        for location in LOCATIONS:
-            print(f"🔍 Szukam: '{search_term}' w '{location}'...")
-            
-            try:
-                jobs = scrape_jobs(
-                    site_name=["indeed"],  # Tylko Indeed (bez rate limitingu)
-                    search_term=search_term,
-                    location=location,
-                    results_wanted=50,  # Więcej wyników z Indeed
-                    is_remote=True,
-                    country_indeed='Poland',
-                )
-                
-                if jobs is not None and len(jobs) > 0:
-                    print(f"   ✅ Znaleziono {len(jobs)} ofert")
-                    all_jobs.append(jobs)
-                else:
-                    print(f"   ⚠️ Brak wyników")
-                    
-            except Exception as e:
-                print(f"   ❌ Błąd: {str(e)}")
-    
-    if not all_jobs:
+    start = time.monotonic()
+    df_all, timings = scrape_all(SEARCH_TERMS, LOCATIONS, SITES)
+    print_scrape_stats(timings, time.monotonic() - start)
+    
+    if df_all is None:
         print("\n❌ Nie znaleziono żadnych ofert!")
         return
     
-    # Połącz wszystkie DataFrames
-    import pandas as pd
-    df_all = pd.concat(all_jobs, ignore_index=True)
-    
-    # Usuń duplikaty (po job_url)
-    df_all = df_all.drop_duplicates(subset=['job_url'], keep='first')
-    
     print(f"\n✅ Łącznie znaleziono {len(df_all)} unikalnych ofert (przed filtrowaniem)\n")
     
-    # 2. Filtrowanie i analiza
-    filtered_jobs = []
-    
+    # 2. Filtrowanie i analiza - batch na całym DataFrame
     print(f"📊 Analizuję oferty...\n")
+    scores = score_jobs_frame(df_all)
     
-    for idx, row in df_all.iterrows():
-        job_data = row.to_dict()
-        
-        print(f"[{idx+1}/{len(df_all)}] {job_data.get('title', 'Unknown')[:60]}...")
-        
-        # Hard filters
-        # Lokalizacja
-        if not check_location(job_data):
-            print(f"   ❌ Lokalizacja: {job_data.get('location', 'Unknown')}")
-            continue
-        
-        # Poziom stanowiska
-        if not check_position_level(job_data.get('title', '')):
-            print(f"   ❌ Poziom stanowiska")
-            continue
-        
-        # Wynagrodzenie (jeśli podane)
-        salary_pln = extract_salary_pln(job_data)
-        if salary_pln > 0 and salary_pln < MIN_SALARY_PLN:
-            print(f"   ❌ Wynagrodzenie: {salary_pln:,.0f} PLN (min: {MIN_SALARY_PLN:,.0f} PLN)")
-            continue
-        
-        # Scoring
-        match_result = calculate_cv_match(job_data)
-        
-        # Odrzuć oferty <50%
-        if match_result['score'] < 50:
-            print(f"   ❌ Score: {match_result['score']}% (min: 50%)")
-            continue
-        
-        print(f"   ✅ PASS - Score: {match_result['score']}% - {match_result['verdict']}")
+    print(f"   ❌ Lokalizacja: {(~scores['location_ok']).sum()}")
+    print(f"   ❌ Poziom stanowiska: {(scores['location_ok'] & ~scores['level_ok']).sum()}")
+    print(f"   ❌ Wynagrodzenie < {MIN_SALARY_PLN:,.0f} PLN: {(scores['location_ok'] & scores['level_ok'] & ~scores['salary_ok']).sum()}")
+    print(f"   ❌ Score < 50%: {(scores['location_ok'] & scores['level_ok'] & scores['salary_ok'] & ~scores['passed']).sum()}\n")
+    
+    category_names = [category for category, *_ in SCORING_CATEGORIES]
+    filtered_jobs = []
+    for idx in scores.index[scores['passed']]:
+        job_data = df_all.loc[idx].to_dict()
+        s_row = scores.loc[idx]
+        match_result = {
+            'score': int(s_row['score']),
+            'breakdown': {category: int(s_row[category]) for category in category_names},
+            'verdict': s_row['verdict'],
+            'status': s_row['status'],
+        }
+        print(f"   ✅ PASS - {str(job_data.get('title', 'Unknown'))[:60]} - Score: {match_result['score']}% - {match_result['verdict']}")
         
         # Dodaj do listy
         filtered_jobs.append({
@@ -398,7 +481,8 @@ def job_hunter():
             job_data.get('title', 'Unknown'),
             job_data.get('location', 'Unknown'),
             job_data.get('job_url', ''),
-            match['status']
+            match['status'],
+            salary=extract_salary_fields(job_data)
         )
         
         # Pobierz ID oferty
@@ -426,6 +510,8 @@ def job_hunter():
         print("=" * 100)
         print()
     
+    # Nowe oferty od razu w wyszukiwaniu (db_manager.py --search)
+    refresh_search_index()
     print(f"\n🎉 Job Hunter v2.0 zakończony! Znaleziono {len(filtered_jobs)} dopasowanych ofert.")
 
 
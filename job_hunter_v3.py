@@ -4,14 +4,23 @@ JOB HUNTER v3.4.2 - The Clean Import Edition
 
 import os
 import yaml
+import time
 import asyncio
+import argparse
 from datetime import datetime
 from pathlib import Path
-from curl_cffi.requests import AsyncSession
 
 # Czyste importy dzięki zmianie nazwy folderu na Pracuj_pl_Scraper
-from Pracuj_pl_Scraper.scraper import PracujScraper
-from Pracuj_pl_Scraper.get_offer_details import get_offer_details
+from rate_limiter import AdaptiveRateLimiter, classify_error
+from http_client import ThrottledSession, session_from_settings, fetch_offer_details, DETAILS_ACCEPTS_CLIENT, DETAILS_FALLBACK_NOTE
+from http_cache import ResponseCache
+from scoring import ProfileScorer, load_profiles, offer_full_text
+from prefilter import PreFilter, SALARY_REASON
+from salary import parse_salary_text
+from sources import SourceContext, build_sources
+from near_dup import NearDupIndex, offer_text
+from tfidf import TfidfIndex
+from text_norm import normalized
 import db_manager
 
 # ===== ŁADOWANIE KONFIGURACJI =====
@@ -20,62 +29,27 @@ CONFIG_PATH = BASE_DIR / "config.yaml"
 with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
     CONFIG = yaml.safe_load(f)
 
+# Wszystkie profile scoringu skompilowane raz na proces (jedno przeszukanie tekstu na ofertę)
+SCORER = ProfileScorer(load_profiles(CONFIG))
+
 # ===== FUNKCJE POMOCNICZE =====
 
-def pre_filter_offer(offer: dict) -> bool:
-    title = offer.get('Title', '').lower()
-    location = offer.get('Location', '').lower()
-    f = CONFIG['filters']
-    
-    if not any(loc in location for loc in f['allowed_locations']):
-        return False, "Zła lokalizacja"
-    if any(ex in title for ex in f['excluded_title_keywords']):
-        return False, "Wykluczone słowo w tytule"
-    if not any(req in title for req in f['required_title_keywords']):
-        return False, "Brak kluczowego poziomu w tytule"
-        
-    return True, "OK"
+def pre_filter_offer(offer: dict) -> tuple:
+    return PRE_FILTER(offer)
 
 def calculate_cv_match(details: dict) -> dict:
-    score = 0
-    breakdown = {}
-    
-    text = " ".join([
-        str(details.get('title', '')),
-        str(details.get('description', '')),
-        " ".join(details.get('responsibilities', [])),
-        " ".join(details.get('requirements', [])),
-    ]).lower()
-    
-    sw = CONFIG['scoring_weights']
-    
-    for category, cfg in sw.items():
-        weight = cfg['weight']
-        keywords = cfg['keywords']
-        cat_score = sum( (weight * 0.4) if kw in text else 0 for kw in keywords[:2])
-        bonus = 10 if any(kw in text for kw in keywords[2:]) else 0
-        final_cat_score = min(cat_score + bonus, weight)
-        
-        breakdown[category] = int(final_cat_score)
-        score += final_cat_score
-
-    score = int(score)
-    if score >= 85: verdict, status = "🔥 MUST APPLY", "Lead"
-    elif score >= 70: verdict, status = "✅ STRONG MATCH", "Lead"
-    elif score >= 50: verdict, status = "⚠️ MAYBE", "poczekalnia"
-    else: verdict, status = "❌ REJECT", "Rejected"
-    
-    return {'score': score, 'breakdown': breakdown, 'verdict': verdict, 'status': status}
+    return SCORER.match(details)
+
+def pre_score_offer(offer: dict) -> int:
+    """Tani scoring z danych listy (tytuł/firma/lokalizacja, najlepszy profil) - tylko do kolejności pobierania szczegółów"""
+    return SCORER.score_text(normalized(offer).folded('Title', 'Company', 'Location'))[0]
 
 def extract_salary(salary_str: str) -> int:
-    import re
-    if not salary_str or "Nie podano" in salary_str: return 0
-    salary_clean = salary_str.replace(' ', '').replace(',', '.')
-    numbers = re.findall(r'\d+', salary_clean)
-    if not numbers: return 0
-    val = int(numbers[0])
-    if 'rok' in salary_clean.lower() or 'year' in salary_clean.lower(): val = val // 12
-    return val
+    """Miesięczne PLN ("od" widełek); 0 = brak pensji"""
+    return parse_salary_text(salary_str)['salary_monthly_pln']
+
+# Reguły pre-filtra z sekcji `filters` (+ pensja z listy); kolejność dobierana z liczników z poprzednich runów
+PRE_FILTER = PreFilter(CONFIG['filters'], BASE_DIR / 'prefilter_stats.json', parse_salary=extract_salary)
 
 def create_folder(details: dict, match: dict):
     cv_path = BASE_DIR / 'CV Moje'
@@ -92,46 +66,206 @@ def create_folder(details: dict, match: dict):
     content += "### Responsibilities:\n" + "\n".join([f"- {r}" for r in details.get('responsibilities', [])])
     
     (path / "00_OFERTA.md").write_text(content, encoding='utf-8')
-    (path / "01_ANALIZA.md").write_text(f"# Analiza\nScoring: {match['score']}%\nBreakdown: {match['breakdown']}", encoding='utf-8')
+    (path / "01_ANALIZA.md").write_text(
+        f"# Analiza\nScoring: {match['score']}% (profil: {match['profile']})\nBreakdown: {match['breakdown']}\n"
+        f"Profile: {match['profiles']}", encoding='utf-8')
     print(f"   📂 Katalog utworzony: {folder_name}")
 
 # ===== ENGINE =====
 
-async def job_hunter():
-    print("="*60)
-    print(f"🚀 JOB HUNTER v3.4.2 - CLEAN ({len(CONFIG['search_queries'])} queries)")
-    print("="*60)
-    
-    scraper = PracujScraper()
-    all_raw_offers = []
-    
-    async with AsyncSession() as client:
-        for q in CONFIG['search_queries']:
-            print(f"📡 Scraping: {q['description']}...")
-            try:
-                res = await scraper.scrape_keyword(client, q['keyword'], max_pages=CONFIG['settings']['max_pages_per_query'])
-                if res: all_raw_offers.extend(res)
-            except Exception as e: print(f"   ❌ Error: {e}")
-            
-    unique_list = {o['Link']: o for o in all_raw_offers}.values()
-    print(f"\n📊 Total on list: {len(unique_list)}")
-    
-    print(f"🧹 Pre-filtering...")
-    candidates = []
-    for o in unique_list:
+def create_limiter(settings: dict) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(
+        settings['rate_limit_per_sec'], settings['rate_limit_burst'],
+        min_rate=settings['rate_limit_min'], max_rate=settings['rate_limit_max'],
+        increase=settings['rate_limit_increase'], decrease=settings['rate_limit_decrease'],
+        breaker_threshold=settings['breaker_threshold'], breaker_cooldown_sec=settings['breaker_cooldown_sec'],
+    )
+
+def create_near_dup(settings: dict) -> NearDupIndex:
+    return NearDupIndex(
+        'scan_cache', num_perm=settings['near_dup_num_perm'], bands=settings['near_dup_bands'],
+        threshold=settings['near_dup_threshold'],
+    )
+
+def create_tfidf(settings: dict) -> TfidfIndex | None:
+    """Słownik TF-IDF z ofert w scan_cache (dolicza nowe od poprzedniego runu) + pliki CV; None bez plików CV"""
+    index = TfidfIndex('scan_cache')
+    added = index.update()
+    n_cv = index.load_cv(BASE_DIR / settings['tfidf_cv_dir'])
+    if not n_cv:
+        print(f"⚠️ TF-IDF: no .md/.txt CV files in {settings['tfidf_cv_dir']} - CV similarity disabled")
+        return None
+    print(f"📚 TF-IDF: {len(index.vocab)} terms from {index.n_docs} offers (+{added}), {n_cv} CV files")
+    return index
+
+def check_near_dup(near_dup: NearDupIndex, url: str, details: dict) -> str | None:
+    """URL oferty kanonicznej, jeśli to prawie-duplikat; nowa oferta trafia do indeksu"""
+    sig = near_dup.signature(offer_text(details.get('company'), offer_full_text(details)))
+    dup = near_dup.find(url, sig)
+    near_dup.add(url, sig, dup[0] if dup else None)
+    return dup[0] if dup else None
+
+def create_cache(settings: dict) -> ResponseCache:
+    return ResponseCache(
+        BASE_DIR / 'http_cache.duckdb',
+        ttl_hours={'list': settings['cache_ttl_list_hours'], 'detail': settings['cache_ttl_detail_hours']},
+        max_mb=settings['cache_max_mb'],
+    )
+
+# ===== PIPELINE STRUMIENIOWY =====
+# list (+dedup) → pre-filter → detail (kolejka priorytetowa) → score → zapis/folder
+# Etapy połączone ograniczonymi kolejkami: pełna kolejka wstrzymuje etap przed nią,
+# więc w pamięci jest tylko tyle ofert, ile mieszczą kolejki (plus zbiór widzianych linków).
+
+STOP = None
+
+async def run_stages(*stages):
+    """Etapy jako taski; błąd jednego anuluje pozostałe (zamiast zawiesić je na kolejkach)"""
+    tasks = [asyncio.create_task(s) for s in stages]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for t in tasks: t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+async def list_stage(sources: list, ctx: SourceContext, stats: dict):
+    """Wszystkie źródła naraz: async na pętli, blokujące w wątkach; run trwa tyle, co najwolniejsze"""
+    print(f"📡 Scraping sources: {', '.join(src.name for src in sources)}")
+    start = time.monotonic()
+
+    async def one(src):
+        t0 = time.monotonic()
+        try:
+            res = await src.run(ctx)
+        except Exception as e:
+            print(f"   ❌ Source {src.name}: {e}")
+            res = {'calls': 0, 'errors': 1}
+        stats['sources'][src.name] = {**res, 'sec': round(time.monotonic() - t0, 1)}
+
+    await asyncio.gather(*(one(src) for src in sources))
+    stats['list_pages_saved'] = sum(getattr(src, 'pages_saved', 0) for src in sources)
+    stats['list_total'] = len(ctx.seen)
+    stats['list_sec'] = round(time.monotonic() - start, 1)
+    print(f"📊 List done: {len(ctx.seen)} unique offers in {stats['list_sec']}s")
+    await ctx.out_q.put(STOP)
+
+async def prefilter_stage(known_urls: set, stats: dict, in_q: asyncio.Queue, out_q: asyncio.PriorityQueue, workers: int,
+                          near_dup: NearDupIndex, dup_q: asyncio.Queue, ready: asyncio.Event):
+    """
+    Reguły z filters + pominięcie znanych; do kolejki szczegółów z priorytetem = tani pre-score z listy.
+    Oferty z pełną treścią już na liście (JobSpy) sprawdzane od razu pod prawie-duplikaty -> dup_q (zapis).
+    ready: ustawiany, gdy kolejka szczegółów jest pełna albo pre-filtr skończył (start workerów przy limicie).
+    """
+    seq = 0
+    while (o := await in_q.get()) is not STOP:
+        # Tekst pól liczony raz na ofertę - wspólny dla reguł pre-filtra i pre-score
+        o = normalized(o)
         passed, reason = pre_filter_offer(o)
-        if passed: candidates.append(o)
-    
-    print(f"✅ Candidates for deep analysis: {len(candidates)}")
+        if not passed:
+            stats['rejections'][reason] = stats['rejections'].get(reason, 0) + 1
+            # Pensja z listy: request po szczegóły, który i tak skończyłby się "Salary too low" -
+            # liczony tylko, gdy pozostałe reguły by ofertę przepuściły (inaczej i tak bez requestu)
+            if reason == SALARY_REASON and o['Link'] not in known_urls and PRE_FILTER.passes_others(o, SALARY_REASON):
+                stats['salary_prefiltered'] = stats.get('salary_prefiltered', 0) + 1
+            continue
+        # Już przeskanowane oferty nie idą do (limitowanego) pobierania szczegółów
+        if o['Link'] in known_urls:
+            stats['known_skipped'] = stats.get('known_skipped', 0) + 1
+            continue
+        if o.get('Details'):
+            canonical_url = check_near_dup(near_dup, o['Link'], o['Details'])
+            if canonical_url:
+                stats['near_dup_list'] = stats.get('near_dup_list', 0) + 1
+                await dup_q.put((o, o['Details'], None, canonical_url))
+                continue
+        seq += 1
+        await out_q.put((-pre_score_offer(o), seq, o))
+        if out_q.full():
+            ready.set()
+    ready.set()
+    PRE_FILTER.save_stats()
+    stats['candidates'] = seq
+    for i in range(workers):
+        await out_q.put((float('inf'), seq + 1 + i, STOP))
+
+async def fetch_detail(session, url: str, limiter: AdaptiveRateLimiter, block_retries: int,
+                       cache: ResponseCache = None, max_requests: int = None, stats: dict = None,
+                       refresh: bool = False) -> dict | None:
+    """
+    Szczegóły jednej oferty: cache, potem request przez limiter; blokada = ponowienie
+    (acquire() poczeka na obniżone tempo / breaker).
+    max_requests: limit requestów sieciowych na run; po jego wyczerpaniu None
+    (trafienia w cache nie zużywają limitu).
+    refresh: oferta z bazy do odświeżenia (--refresh-older-than) - bez odczytu z cache
+    (TTL cache może być dłuższy niż próg odświeżenia), świeży wynik i tak trafia do cache.
+    """
+    cached = cache.get_json(url, 'detail') if cache and not refresh else None
+    if cached is not None:
+        return cached
     
-    pauza = CONFIG['settings']['deep_analysis_pauza_sec']
-    for idx, cand in enumerate(candidates, 1):
-        print(f"[{idx}/{len(candidates)}] Analysis: {cand.get('Title', '')[:40]} | {cand.get('Company', '')}")
+    for _ in range(block_retries + 1):
+        if max_requests is not None and stats['detail_requests'] >= max_requests:
+            return None
+        stats['detail_requests'] += 1
+        await limiter.acquire()
+        try:
+            details = await fetch_offer_details(session, url)
+        except Exception as e:
+            details = {'error': str(e)}
         
-        if idx > 1: await asyncio.sleep(pauza)
+        reason = classify_error(details.get('error'))
+        if reason:
+            limiter.record_block(reason)
+            continue
+        if 'error' not in details:
+            limiter.record_success()
+            if cache: cache.put_json(url, 'detail', details)
+        return details
+    return details
+
+async def detail_stage(session, limiter: AdaptiveRateLimiter, stats: dict, in_q: asyncio.PriorityQueue,
+                       out_q: asyncio.Queue, cache: ResponseCache = None, max_requests: int = None,
+                       refresh_urls: set = frozenset(), ready: asyncio.Event = None):
+    """
+    Pula workerów; każdy bierze z kolejki ofertę o najwyższym pre-score spośród czekających
+    (kolejka ograniczona, więc priorytet działa w obrębie bufora detail_queue_size).
+    Z limitem requestów workery czekają na `ready` - bez tego brałyby oferty w kolejności
+    napływu i limit zużyłyby pierwsze, a nie najlepsze. Ranking jest wtedy globalny, o ile
+    kandydatów jest nie więcej niż detail_queue_size; przy większej liczbie - w obrębie bufora.
+    refresh_urls: zapisane, ale przeterminowane oferty - pobierane z sieci, nie z cache.
+    """
+    settings = CONFIG['settings']
+    stats.setdefault('detail_requests', 0)
+
+    async def worker():
+        while (item := await in_q.get())[2] is not STOP:
+            priority, _, cand = item
+            # Źródła z pełną treścią na liście (JobSpy) nie potrzebują requestu
+            details = cand.get('Details') or await fetch_detail(
+                session, cand['Link'], limiter, settings['block_retries'], cache, max_requests, stats,
+                refresh=cand['Link'] in refresh_urls)
+            await out_q.put((cand, -priority, details))
+
+    budget_note = f", max {max_requests} requests" if max_requests is not None else ""
+    if max_requests is not None and ready is not None:
+        await ready.wait()
+    print(f"⏱️ Fetching details: {settings['detail_workers']} workers, {limiter.rate:.2f} req/s (burst {limiter.burst}){budget_note}")
+    await asyncio.gather(*(worker() for _ in range(settings['detail_workers'])))
+    await out_q.put(STOP)
+
+async def score_stage(stats: dict, in_q: asyncio.Queue, out_q: asyncio.Queue, near_dup: NearDupIndex,
+                      tfidf: TfidfIndex = None):
+    idx = 0
+    while (item := await in_q.get()) is not STOP:
+        cand, pre_score, details = item
+        if details is None:
+            stats['budget_skipped'] = stats.get('budget_skipped', 0) + 1
+            continue
+        details = normalized(details)
+        idx += 1
+        print(f"[{idx}] Analysis: {cand.get('Title', '')[:40]} | {cand.get('Company', '')} (pre-score {pre_score}%)")
         
         try:
-            details = await get_offer_details(cand['Link'])
             if 'error' in details:
                 print(f"   ⚠️ Error: {details['error']}")
                 continue
@@ -140,27 +274,160 @@ async def job_hunter():
             if 0 < salary < CONFIG['filters']['min_salary_pln']:
                 print(f"   ❌ Salary too low: {salary} PLN")
                 continue
+            
+            # Oferty z listą sprawdzone już w pre-filtrze (i dodane do indeksu)
+            if not cand.get('Details'):
+                canonical_url = check_near_dup(near_dup, cand['Link'], details)
+                if canonical_url:
+                    stats['near_dup_detail'] = stats.get('near_dup_detail', 0) + 1
+                    print(f"   👯 Near-duplicate of {canonical_url}")
+                    await out_q.put((cand, details, None, canonical_url))
+                    continue
                 
             match = calculate_cv_match(details)
-            print(f"   🎯 MATCH: {match['score']}% ({match['verdict']})")
-            
-            # Zapis do BUFORA CACHE (full_text i score)
-            full_description = f"TITLE: {details.get('title')}\nDESCRIPTION: {details.get('description')}\nRESPONSIBILITIES: {details.get('responsibilities')}\nREQUIREMENTS: {details.get('requirements')}"
-            db_manager.add_offer(
-                details.get('company'), 
-                details.get('title'), 
-                details.get('location'), 
-                cand['Link'], 
-                status=match['status'],
-                full_text=full_description,
-                score=match['score'],
-                db='scan_cache'
-            )
+            if tfidf:
+                match['cv_similarity'] = round(float(tfidf.similarity([offer_full_text(details)])[0]) * 100, 1)
+            sim_note = f" | CV sim {match['cv_similarity']}%" if 'cv_similarity' in match else ""
+            print(f"   🎯 MATCH: {match['score']}% ({match['verdict']}) [{match['profile']}]{sim_note}")
+            await out_q.put((cand, details, match, None))
+        except Exception as e: print(f"   ❌ Error at offer {idx}: {e}")
+    await out_q.put(STOP)
+
+async def persist_stage(writer: db_manager.OfferWriter, in_q: asyncio.Queue):
+    while (item := await in_q.get()) is not STOP:
+        cand, details, match, canonical_url = item
+        try:
+            # Zapis do BUFORA CACHE (full_text i score); prawie-duplikat bez scoringu, z linkiem do oferty kanonicznej
+            await writer.put_async({
+                'company': details.get('company'),
+                'title': details.get('title'),
+                'location': details.get('location'),
+                'url': cand['Link'],
+                'status': match['status'] if match else 'Duplicate',
+                'full_text': offer_full_text(details),
+                'score': match['score'] if match else 0,
+                'salary': details.get('salary'),
+                'canonical_url': canonical_url,
+                'profile_scores': match['profiles'] if match else None,
+                'cv_similarity': match.get('cv_similarity') if match else None,
+                **cand.get('SalaryFields', {}),
+            })
             
-            if match['score'] >= CONFIG['settings']['min_score_to_save_folder']:
+            if match and match['score'] >= CONFIG['settings']['min_score_to_save_folder']:
                 create_folder(details, match)
-                
-        except Exception as e: print(f"   ❌ Error at offer {idx}: {e}")
+        except Exception as e: print(f"   ❌ Error saving {cand['Link']}: {e}")
+
+async def job_hunter(refresh_older_than=None, use_cache=True, max_detail_requests=None):
+    print("="*60)
+    print(f"🚀 JOB HUNTER v3.4.2 - CLEAN ({len(CONFIG['search_queries'])} queries)")
+    print("="*60)
+    
+    settings = CONFIG['settings']
+    limiter = create_limiter(settings)
+    stats = {}
+    
+    # Oferty już zapisane w scan_cache - jedno zapytanie na start
+    known_urls = db_manager.get_known_urls('scan_cache', older_than_days=refresh_older_than)
+    refresh_note = f" (re-fetching older than {refresh_older_than} days)" if refresh_older_than is not None else ""
+    print(f"🗂️ Known offers in scan_cache: {len(known_urls)}{refresh_note}")
+    # Przeterminowane oferty z bazy: szczegóły z sieci, nie z cache HTTP
+    refresh_urls = (db_manager.get_known_urls('scan_cache') - known_urls) if refresh_older_than is not None else set()
+    
+    cache = create_cache(settings) if use_cache else None
+    near_dup = create_near_dup(settings)
+    tfidf = create_tfidf(settings)
+    
+    # Zapis do bazy w osobnym wątku (group commit) - pętla asyncio nie czeka na dysk
+    writer = db_manager.OfferWriter(
+        'scan_cache', batch_size=settings['writer_batch_size'],
+        flush_interval_sec=settings['writer_flush_sec'], max_pending=settings['writer_max_pending'],
+    ).start()
+    
+    # Jedna sesja (pula keep-alive) na listę i szczegóły
+    session = session_from_settings(settings)
+    try:
+        await run_pipeline(session, limiter, known_urls, stats, writer, near_dup, cache, max_detail_requests, tfidf,
+                           refresh_urls)
+    finally:
+        # Również przy Ctrl-C: dopisz kolejkę i zamknij zasoby
+        writer.close()
+        near_dup.flush()
+        await session.close()
+        if cache: cache.close()
+    
+    stats['written'] = writer.written
+    stats['write_errors'] = writer.errors
+    stats['near_dup'] = near_dup.summary()
+    # Indeks wyszukiwania (db_manager --search) aktualny od razu po runie
+    stats['search_indexed'] = db_manager.refresh_search_index('scan_cache')
+    print_run_summary(limiter, stats, cache)
+
+async def run_pipeline(session, limiter: AdaptiveRateLimiter, known_urls: set, stats: dict,
+                       writer: db_manager.OfferWriter, near_dup: NearDupIndex, cache: ResponseCache = None,
+                       max_detail_requests: int = None, tfidf: TfidfIndex = None, refresh_urls: set = frozenset()):
+    settings = CONFIG['settings']
+    size = settings['pipeline_queue_size']
+    stats['rejections'] = {}
+    stats['sources'] = {}
+    
+    client = ThrottledSession(session, limiter, cache, max_per_host=settings['http_max_per_host'])
+    sources = build_sources(CONFIG.get('sources', {}), client, CONFIG['search_queries'], settings)
+    offers_q = asyncio.Queue(size)
+    candidates_q = asyncio.PriorityQueue(settings['detail_queue_size'])
+    details_q = asyncio.Queue(size)
+    scored_q = asyncio.Queue(size)
+    
+    candidates_ready = asyncio.Event()
+    
+    print(f"🧹 Pre-filter rule order: {' → '.join(r.name for r in PRE_FILTER.rules)}")
+    await run_stages(
+        list_stage(sources, SourceContext(offers_q, known_urls), stats),
+        prefilter_stage(known_urls, stats, offers_q, candidates_q, settings['detail_workers'], near_dup, scored_q,
+                        candidates_ready),
+        detail_stage(session, limiter, stats, candidates_q, details_q, cache, max_detail_requests, refresh_urls,
+                     candidates_ready),
+        score_stage(stats, details_q, scored_q, near_dup, tfidf),
+        persist_stage(writer, scored_q),
+    )
+
+def print_run_summary(limiter: AdaptiveRateLimiter, stats: dict, cache: ResponseCache = None):
+    rl = limiter.summary()
+    print("\n" + "="*60)
+    print("📈 RUN SUMMARY")
+    print(f"   Final rate: {rl['rate']} req/s | OK requests: {rl['requests_ok']}")
+    print(f"   Back-off events: {rl['backoff_events']} | Circuit breaker trips: {rl['breaker_trips']}")
+    print(f"   Time throttled: {rl['throttled_sec']}s (summed over workers) | paused by breaker: {rl['paused_sec']}s")
+    print(f"   Offers on list: {stats.get('list_total', 0)} unique | candidates for details: {stats.get('candidates', 0)}")
+    for reason, count in sorted(stats.get('rejections', {}).items(), key=lambda x: -x[1]):
+        print(f"   ❌ {reason}: {count}")
+    for name, src in stats.get('sources', {}).items():
+        print(f"   Source {name}: {src['calls']} calls, {src['errors']} errors, {src['sec']}s")
+    print(f"   List page requests saved (early pagination stop): {stats.get('list_pages_saved', 0)}")
+    print(f"   Detail requests saved (already scanned): {stats.get('known_skipped', 0)}")
+    print(f"   Detail requests saved (salary below minimum on list): {stats.get('salary_prefiltered', 0)}")
+    print(f"   Detail requests made: {stats.get('detail_requests', 0)} | skipped over --max-detail-requests: {stats.get('budget_skipped', 0)}")
+    if not DETAILS_ACCEPTS_CLIENT:
+        print(f"   ⚠️ {DETAILS_FALLBACK_NOTE}")
+    for r in PRE_FILTER.summary():
+        print(f"   Pre-filter [{r['rule']}]: {r['rejected']}/{r['evaluated']} rejected")
+    nd = stats.get('near_dup', {})
+    print(f"   Near-duplicates: {stats.get('near_dup_list', 0)} on list (no detail request) + {stats.get('near_dup_detail', 0)} after details | {nd.get('indexed', 0)} offers indexed")
+    print(f"   Offers written to scan_cache: {stats.get('written', 0)} (write errors: {stats.get('write_errors', 0)})")
+    if cache:
+        cs = cache.summary()
+        print(f"   HTTP cache: {cs['hits']} hits / {cs['misses']} misses | {cs['size_mb']} MB on disk, {cs['evicted']} evicted")
+    if stats.get('search_indexed') is not None:
+        print(f"   Search index: {stats['search_indexed']} offers (re)indexed")
+    for ev in limiter.backoff_events:
+        print(f"   🐢 {ev['at']} {ev['reason']} → {ev['rate']} req/s")
+    print("="*60)
 
 if __name__ == "__main__":
-    asyncio.run(job_hunter())
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--refresh-older-than', type=int, metavar='DAYS', help='Re-fetch already scanned offers older than N days')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the on-disk HTTP cache')
+    parser.add_argument('--max-detail-requests', type=int, metavar='N', help='Cap detail requests per run (best list pre-scores first)')
+    args = parser.parse_args()
+    
+    asyncio.run(job_hunter(refresh_older_than=args.refresh_older_than, use_cache=not args.no_cache,
+                           max_detail_requests=args.max_detail_requests))
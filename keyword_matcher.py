@@ -0,0 +1,32 @@
+"""
+Dopasowanie słów kluczowych (scoring.ProfileScorer)
+
+KeywordMatcher kompilowany raz z config.yaml: wszystkie słowa ze wszystkich profili
+szukane jednym przejściem po tekście (automat Aho-Corasick z pyahocorasick).
+Bez pyahocorasick: każde unikalne słowo sprawdzane raz (`kw in text`).
+Semantyka jak w `kw in text` - dopasowanie podciągu, również w środku wyrazu.
+"""
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        """keywords: słowa kluczowe (duplikaty pomijane)"""
+        self.keywords = sorted(set(keywords))
+
+        self._automaton = None
+        if ahocorasick is not None and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for kw in self.keywords:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+
+    def find(self, text: str) -> set:
+        """Wszystkie słowa kluczowe występujące w tekście (tekst już lower-case)"""
+        if self._automaton is not None:
+            return {kw for _, kw in self._automaton.iter(text)}
+        return {kw for kw in self.keywords if kw in text}
@@ -0,0 +1,199 @@
+"""
+Wykrywanie prawie-duplikatów ofert (MinHash + LSH)
+
+Ta sama rola na Pracuj.pl i Indeed albo ponownie opublikowana pod nowym URL-em ma inny
+source_url, ale prawie ten sam tekst. Tekst (firma + tytuł + treść) -> shingle (n-gramy słów)
+-> sygnatura MinHash. Sygnatura dzielona na pasma (LSH): kandydaci to oferty z tym samym
+kubełkiem w którymkolwiek paśmie, potwierdzani oszacowanym podobieństwem Jaccarda.
+Sygnatury i kubełki leżą w tabelach offer_minhash / offer_lsh obok offers (migracja 5).
+
+Uzupełnienie indeksu dla ofert zapisanych wcześniej:
+    python near_dup.py --rebuild --db scan_cache
+"""
+
+import argparse
+import hashlib
+import re
+import zlib
+
+import numpy as np
+
+import db_manager
+
+TOKEN_RE = re.compile(r'\w+')
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def offer_text(company: str, full_text: str) -> str:
+    """Tekst do sygnatury - ten sam dla zapisu z pipeline'u i dla --rebuild z bazy"""
+    return f"{company or ''}\n{full_text or ''}"
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """N-gramy słów (lower-case, bez interpunkcji); krótszy tekst = jeden shingle"""
+    tokens = TOKEN_RE.findall(text.lower())
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class MinHasher:
+    """num_perm permutacji (a*x + b) mod p na 32-bitowym hashu shingla; stały seed = stabilne sygnatury"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, _MERSENNE, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, _MERSENNE, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: set) -> np.ndarray | None:
+        if not shingle_set:
+            return None
+        hv = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle_set), dtype=np.uint64, count=len(shingle_set))
+        # Przepełnienie uint64 przy a*x jest zamierzone (jak w datasketch)
+        phv = ((np.outer(hv, self.a) + self.b) % _MERSENNE) & _MAX_HASH
+        return phv.min(axis=0).astype(np.uint32)
+
+
+class NearDupIndex:
+    """
+    Indeks prawie-duplikatów jednej bazy, trzymany w pamięci na czas runu.
+    Nowe wpisy czekają w _pending i trafiają do bazy w flush() (jedna transakcja).
+    """
+
+    def __init__(self, db: str = 'scan_cache', num_perm: int = 64, bands: int = 16,
+                 threshold: float = 0.8, shingle_size: int = 3):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) musi być wielokrotnością bands ({bands})")
+        self.db = db
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        self.signatures = {}  # url -> sygnatura
+        self.canonical = {}   # url duplikatu -> url oferty kanonicznej
+        self.buckets = {}     # (pasmo, kubełek) -> set(url)
+        self._pending = {}
+        self.checked = 0
+        self.duplicates = 0
+        self._load()
+
+    def _load(self):
+        with db_manager.get_conn(self.db) as conn:
+            for url, canonical_url, sig in conn.execute(
+                    "SELECT source_url, canonical_url, signature FROM offer_minhash").fetchall():
+                self._index(url, np.array(sig, dtype=np.uint32), canonical_url)
+
+    def _band_keys(self, sig: np.ndarray) -> list:
+        keys = []
+        for band in range(self.bands):
+            chunk = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+            bucket = int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'little', signed=True)
+            keys.append((band, bucket))
+        return keys
+
+    def _index(self, url: str, sig: np.ndarray, canonical_url: str = None):
+        old = self.signatures.get(url)
+        if old is not None:
+            for key in self._band_keys(old):
+                self.buckets[key].discard(url)
+        self.signatures[url] = sig
+        for key in self._band_keys(sig):
+            self.buckets.setdefault(key, set()).add(url)
+        if canonical_url:
+            self.canonical[url] = canonical_url
+        else:
+            self.canonical.pop(url, None)
+
+    def signature(self, text: str) -> np.ndarray | None:
+        return self.hasher.signature(shingles(text, self.shingle_size))
+
+    def find(self, url: str, sig: np.ndarray) -> tuple | None:
+        """(url oferty kanonicznej, podobieństwo) dla najbliższej oferty >= threshold albo None"""
+        if sig is None:
+            return None
+        self.checked += 1
+        candidates = set()
+        for key in self._band_keys(sig):
+            candidates.update(self.buckets.get(key, ()))
+        candidates.discard(url)
+
+        best = None
+        for other in candidates:
+            sim = float(np.mean(self.signatures[other] == sig))
+            if sim >= self.threshold and (best is None or sim > best[1]):
+                best = (other, sim)
+        if best is None:
+            return None
+        self.duplicates += 1
+        return self.canonical.get(best[0], best[0]), best[1]
+
+    def add(self, url: str, sig: np.ndarray, canonical_url: str = None):
+        """Dodaje ofertę do indeksu (duplikat z canonical_url - kolejne kopie trafią do tej samej oferty)"""
+        if sig is None:
+            return
+        self._index(url, sig, canonical_url)
+        self._pending[url] = (canonical_url, sig)
+
+    def flush(self):
+        if not self._pending:
+            return
+        urls = list(self._pending)
+        lsh = [(band, bucket, url) for url in urls for band, bucket in self._band_keys(self._pending[url][1])]
+        with db_manager.get_conn(self.db) as conn:
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                conn.execute("DELETE FROM offer_lsh WHERE source_url IN (SELECT unnest(?::VARCHAR[]))", (urls,))
+                conn.execute("""
+                    INSERT OR REPLACE INTO offer_minhash
+                    SELECT unnest(?::VARCHAR[]), unnest(?::VARCHAR[]), unnest(?::UINTEGER[][])
+                """, (urls, [self._pending[u][0] for u in urls], [self._pending[u][1].tolist() for u in urls]))
+                conn.execute("""
+                    INSERT INTO offer_lsh
+                    SELECT unnest(?::SMALLINT[]), unnest(?::BIGINT[]), unnest(?::VARCHAR[])
+                """, ([r[0] for r in lsh], [r[1] for r in lsh], [r[2] for r in lsh]))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self._pending.clear()
+
+    def rebuild(self) -> int:
+        """Sygnatury dla ofert z bazy, które ich jeszcze nie mają (kolejność id = starsza oferta kanoniczna)"""
+        with db_manager.get_conn(self.db) as conn:
+            rows = conn.execute("""
+                SELECT o.source_url, c.name, o.full_text FROM offers o
+                LEFT JOIN companies c ON o.company_id = c.id
+                WHERE o.source_url NOT IN (SELECT source_url FROM offer_minhash)
+                ORDER BY o.id
+            """).fetchall()
+        links = []
+        for url, company, full_text in rows:
+            sig = self.signature(offer_text(company, full_text))
+            dup = self.find(url, sig)
+            self.add(url, sig, dup[0] if dup else None)
+            if dup:
+                links.append((url, dup[0]))
+        self.flush()
+        db_manager.set_canonical(links, self.db)
+        return len(rows)
+
+    def summary(self) -> dict:
+        return {'indexed': len(self.signatures), 'checked': self.checked, 'duplicates': self.duplicates}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rebuild', action='store_true', help='Index offers that have no MinHash signature yet')
+    parser.add_argument('--db', default='scan_cache', help='Database name (main or scan_cache)')
+    parser.add_argument('--threshold', type=float, default=0.8, help='Estimated Jaccard similarity for a duplicate')
+    args = parser.parse_args()
+
+    index = NearDupIndex(args.db, threshold=args.threshold)
+    if args.rebuild:
+        added = index.rebuild()
+        s = index.summary()
+        print(f"✅ Indexed {added} offers ({s['indexed']} total), near-duplicates linked: {s['duplicates']}")
@@ -0,0 +1,131 @@
+"""
+Pre-filtering ofert z listy (przed pobieraniem szczegółów)
+
+Sekcja `filters` z config.yaml kompilowana raz do listy reguł. Reguły wykonywane są
+w kolejności: najpierw te, które najczęściej odrzucają przy najmniejszym koszcie
+(liczba słów do sprawdzenia). Liczniki pass/reject zapisywane są między runami,
+więc kolejka sama się przestawia pod to, jakie oferty faktycznie przychodzą.
+Słowa porównywane bez wielkości liter i polskich znaków (text_norm.fold), tekst pól
+oferty normalizowany raz (NormalizedOffer) niezależnie od liczby reguł.
+"""
+
+import json
+from pathlib import Path
+
+from text_norm import fold, normalized
+
+
+class Rule:
+    """Pojedyncza reguła: predicate(offer: NormalizedOffer) -> True = przechodzi"""
+
+    def __init__(self, name: str, reason: str, predicate, cost: float, fingerprint: str = ''):
+        self.name = name
+        self.reason = reason
+        self.predicate = predicate
+        self.cost = max(cost, 1)
+        self.fingerprint = fingerprint
+        # Liczniki z poprzednich runów + bieżący run
+        self.hist_evaluated = 0
+        self.hist_rejected = 0
+        self.evaluated = 0
+        self.rejected = 0
+
+    @property
+    def priority(self) -> float:
+        """Szansa odrzucenia (wygładzona) na jednostkę kosztu - im wyżej, tym wcześniej"""
+        evaluated = self.hist_evaluated + self.evaluated
+        rejected = self.hist_rejected + self.rejected
+        return (rejected + 1) / (evaluated + 2) / self.cost
+
+    def __call__(self, offer: dict) -> bool:
+        self.evaluated += 1
+        if self.predicate(offer):
+            return True
+        self.rejected += 1
+        return False
+
+
+def keyword_rule(name: str, reason: str, field: str, keywords: list, require: bool) -> Rule:
+    """require=True: pole musi zawierać któreś ze słów; False: nie może zawierać żadnego"""
+    keywords = tuple(dict.fromkeys(fold(kw) for kw in keywords))
+
+    def predicate(offer):
+        value = offer.folded(field)
+        return any(kw in value for kw in keywords) == require
+
+    return Rule(name, reason, predicate, cost=len(keywords), fingerprint="|".join(keywords))
+
+
+SALARY_REASON = "Za niskie wynagrodzenie (lista)"
+
+
+def salary_rule(min_salary: int, parse_salary, field: str = 'Salary') -> Rule:
+    """Odrzuca oferty, których widełki z listy są poniżej minimum; brak pensji = przechodzi"""
+
+    def predicate(offer):
+        salary = parse_salary(offer.get(field) or '')
+        return not (0 < salary < min_salary)
+
+    return Rule('salary', SALARY_REASON, predicate, cost=1, fingerprint=str(min_salary))
+
+
+class PreFilter:
+    def __init__(self, filters: dict, stats_path=None, parse_salary=None):
+        """parse_salary(str) -> miesięczne PLN; podany = reguła min_salary_pln już na liście"""
+        self.stats_path = Path(stats_path) if stats_path else None
+        self.rules = [
+            keyword_rule('location', "Zła lokalizacja", 'Location', filters['allowed_locations'], require=True),
+            keyword_rule('title_excluded', "Wykluczone słowo w tytule", 'Title', filters['excluded_title_keywords'], require=False),
+            keyword_rule('title_required', "Brak kluczowego poziomu w tytule", 'Title', filters['required_title_keywords'], require=True),
+        ]
+        if parse_salary is not None and filters.get('min_salary_pln'):
+            self.rules.append(salary_rule(filters['min_salary_pln'], parse_salary))
+        self._load_stats()
+        self.reorder()
+
+    def reorder(self):
+        self.rules.sort(key=lambda r: r.priority, reverse=True)
+
+    def __call__(self, offer: dict) -> tuple:
+        """(True, "OK") albo (False, powód odrzucenia)"""
+        offer = normalized(offer)
+        for rule in self.rules:
+            if not rule(offer):
+                return False, rule.reason
+        return True, "OK"
+
+    def passes_others(self, offer: dict, reason: str) -> bool:
+        """Czy oferta przechodzi wszystkie reguły poza tą z danym powodem (bez liczników - tylko do statystyk)"""
+        offer = normalized(offer)
+        return all(rule.predicate(offer) for rule in self.rules if rule.reason != reason)
+
+    def _load_stats(self):
+        if not self.stats_path or not self.stats_path.exists():
+            return
+        saved = json.loads(self.stats_path.read_text(encoding='utf-8'))
+        for rule in self.rules:
+            s = saved.get(rule.name)
+            # Zmienione słowa w config.yaml = stare liczniki nieaktualne
+            if s and s.get('fingerprint') == rule.fingerprint:
+                rule.hist_evaluated = s['evaluated']
+                rule.hist_rejected = s['rejected']
+
+    def save_stats(self):
+        if not self.stats_path:
+            return
+        data = {
+            r.name: {
+                'fingerprint': r.fingerprint,
+                'evaluated': r.hist_evaluated + r.evaluated,
+                'rejected': r.hist_rejected + r.rejected,
+            }
+            for r in self.rules
+        }
+        self.stats_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    def summary(self) -> list:
+        """Liczniki bieżącego runu w kolejności wykonywania reguł"""
+        return [
+            {'rule': r.name, 'reason': r.reason, 'evaluated': r.evaluated, 'rejected': r.rejected}
+            for r in self.rules
+        ]
@@ -0,0 +1,137 @@
+"""
+Rate limiting dla requestów do Pracuj.pl
+
+TokenBucket - współdzielony limiter (requesty/sek + burst) dla wszystkich workerów.
+AdaptiveRateLimiter - TokenBucket, który sam dobiera tempo (AIMD) i ma circuit breaker
+na blokady Cloudflare (1015/429/403/challenge).
+"""
+
+import asyncio
+import re
+import time
+
+
+class TokenBucket:
+    """Token bucket: `rate` requestów na sekundę, maksymalnie `burst` naraz"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Czeka na wolny token (FIFO - czekający ustawiają się w kolejce na locku)"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# ===== ADAPTACYJNY LIMITER (AIMD + CIRCUIT BREAKER) =====
+
+BLOCK_MARKERS = {
+    'cloudflare_1015': ["error 1015", "you are being rate limited"],
+    'challenge': ["just a moment...", "cf-chl", "challenge-platform", "attention required"],
+}
+
+
+def classify_response(status_code: int, text: str = '') -> str | None:
+    """Zwraca powód blokady (429/403/1015/challenge) albo None dla zdrowej odpowiedzi"""
+    text = (text or '')[:5000].lower()
+    for reason, markers in BLOCK_MARKERS.items():
+        if any(m in text for m in markers):
+            return reason
+    if status_code in (429, 403):
+        return f"http_{status_code}"
+    return None
+
+
+def classify_error(error: str) -> str | None:
+    """Jak classify_response, ale dla komunikatu błędu z get_offer_details"""
+    if not error:
+        return None
+    error = str(error).lower()
+    code = re.search(r'\b(1015|429|403)\b', error)
+    if code:
+        return 'cloudflare_1015' if code.group(1) == '1015' else f"http_{code.group(1)}"
+    return classify_response(0, error)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Token bucket ze zmiennym tempem (AIMD):
+    - każdy zdrowy request podnosi rate o `increase` (do `max_rate`)
+    - blokada (1015/429/403/challenge) mnoży rate przez `decrease` (do `min_rate`)
+    - `breaker_threshold` blokad z rzędu otwiera circuit breaker - cały pipeline stoi `breaker_cooldown_sec`
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.05, max_rate: float = 2.0,
+                 increase: float = 0.02, decrease: float = 0.5,
+                 breaker_threshold: int = 3, breaker_cooldown_sec: float = 300):
+        super().__init__(rate, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown_sec = breaker_cooldown_sec
+
+        self.consecutive_blocks = 0
+        self.backoff_events = []
+        self.breaker_trips = 0
+        self.requests_ok = 0
+        self.throttled_sec = 0.0
+        self.paused_sec = 0.0
+        self._open_until = 0.0
+        self._last_cut = 0.0
+
+    async def acquire(self):
+        start = time.monotonic()
+        while (wait := self._open_until - time.monotonic()) > 0:
+            await asyncio.sleep(wait)
+        await super().acquire()
+        self.throttled_sec += time.monotonic() - start
+
+    def record_success(self):
+        self.requests_ok += 1
+        self.consecutive_blocks = 0
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_block(self, reason: str):
+        now = time.monotonic()
+        self.consecutive_blocks += 1
+        self._tokens = 0
+
+        # Jedna obniżka na "okno" - równoległe requesty z tej samej fali liczą się raz
+        if now - self._last_cut >= 1.0 / self.rate:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._last_cut = now
+            self.backoff_events.append({'reason': reason, 'rate': round(self.rate, 3), 'at': time.strftime('%H:%M:%S')})
+            print(f"   🐢 Blocked ({reason}) → rate cut to {self.rate:.2f} req/s")
+
+        if self.consecutive_blocks >= self.breaker_threshold and now >= self._open_until:
+            self.breaker_trips += 1
+            self.consecutive_blocks = 0
+            self._open_until = now + self.breaker_cooldown_sec
+            self.paused_sec += self.breaker_cooldown_sec
+            print(f"   ⛔ Circuit breaker open: pausing all requests for {self.breaker_cooldown_sec:.0f}s")
+
+    def summary(self) -> dict:
+        return {
+            'rate': round(self.rate, 3),
+            'requests_ok': self.requests_ok,
+            'backoff_events': len(self.backoff_events),
+            'breaker_trips': self.breaker_trips,
+            'throttled_sec': round(self.throttled_sec, 1),
+            'paused_sec': round(self.paused_sec, 1),
+        }
@@ -0,0 +1,157 @@
+"""
+Ponowny scoring zapisanych ofert (bez sieci)
+
+Po zmianie profili scoringu albo progów werdyktu score/status w bazie są nieaktualne.
+rescore czyta offers.full_text paczkami Arrow (fetch_record_batch), liczy scoring
+wszystkich profili w puli procesów (cała paczka naraz - macierz oferty × profile)
+i zapisuje zmienione wyniki jednym UPDATE, a wyniki profili do offer_profile_scores.
+
+    python rescore.py --db scan_cache
+    python rescore.py --db scan_cache --dry-run      # tylko raport zmian
+"""
+
+import argparse
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import yaml
+from tabulate import tabulate
+
+import db_manager
+from scoring import ProfileScorer, SCORED_STATUSES, details_text, load_profiles, parse_full_text, verdict
+
+BASE_DIR = Path(__file__).parent
+CONFIG_PATH = BASE_DIR / "config.yaml"
+
+# Scorer procesu puli - budowany raz w initializerze
+_SCORER = None
+
+
+def _init_worker(profiles: dict):
+    global _SCORER
+    _SCORER = ProfileScorer(profiles)
+
+
+def score_batch(full_texts: list) -> list:
+    """[(score, status, {profil: wynik})] dla paczki full_text"""
+    scores = _SCORER.score_many([details_text(parse_full_text(text)) for text in full_texts])
+    results = []
+    for row in scores.tolist():
+        best = max(row)
+        results.append((best, verdict(best)[1], dict(zip(_SCORER.profiles, row))))
+    return results
+
+
+def _batches(db: str, batch_size: int):
+    """(id, full_text, score, status) paczkami Arrow - w pamięci tylko bieżąca paczka"""
+    with db_manager.get_conn(db) as conn:
+        result = conn.execute("""
+            SELECT id, full_text, score, status FROM offers
+            WHERE full_text IS NOT NULL AND canonical_id IS NULL
+        """)
+        # to_arrow_reader w nowszym duckdb, fetch_record_batch w starszym
+        reader = getattr(result, 'to_arrow_reader', result.fetch_record_batch)(batch_size)
+        for batch in reader:
+            yield batch.to_pydict()
+
+
+def rescore(profiles: dict, db: str = 'scan_cache', workers: int = None, batch_size: int = 5000,
+            dry_run: bool = False) -> dict:
+    """
+    Przelicza score/status (najlepszy profil) i wyniki profili wszystkich ofert z treścią
+    (bez prawie-duplikatów). Status zmieniany tylko, jeśli obecny pochodzi ze scoringu (SCORED_STATUSES);
+    workers=0 - w bieżącym procesie.
+    """
+    workers = os.cpu_count() if workers is None else workers
+    start = time.monotonic()
+    changes = {'id': [], 'score': [], 'status': []}
+    transitions = Counter()
+    best_profiles = Counter()
+    profile_rows = []
+    deltas = []
+    total = 0
+
+    def collect(batch, results):
+        nonlocal total
+        for offer_id, old_score, old_status, (score, status, scores) in zip(batch['id'], batch['score'], batch['status'], results):
+            total += 1
+            profile_rows.extend((offer_id, p, s) for p, s in scores.items())
+            best_profiles[max(scores, key=scores.get)] += 1
+            if old_status not in SCORED_STATUSES:
+                status = old_status
+            if score == old_score and status == old_status:
+                continue
+            changes['id'].append(offer_id)
+            changes['score'].append(score)
+            changes['status'].append(status)
+            deltas.append(score - (old_score or 0))
+            if status != old_status:
+                transitions[(old_status, status)] += 1
+
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(profiles,)) as pool:
+            # Ograniczona liczba paczek w locie - pamięć nie rośnie z rozmiarem bazy
+            pending = deque()
+            for batch in _batches(db, batch_size):
+                pending.append((batch, pool.submit(score_batch, batch['full_text'])))
+                if len(pending) >= workers * 2:
+                    b, fut = pending.popleft()
+                    collect(b, fut.result())
+            while pending:
+                b, fut = pending.popleft()
+                collect(b, fut.result())
+    else:
+        _init_worker(profiles)
+        for batch in _batches(db, batch_size):
+            collect(batch, score_batch(batch['full_text']))
+
+    if changes['id'] and not dry_run:
+        with db_manager.get_conn(db) as conn:
+            conn.execute("""
+                UPDATE offers SET score = n.score, status = n.status, updated_at = now()::TIMESTAMP
+                FROM (SELECT unnest(?::INTEGER[]) AS id, unnest(?::INTEGER[]) AS score, unnest(?::VARCHAR[]) AS status) n
+                WHERE offers.id = n.id
+            """, (changes['id'], changes['score'], changes['status']))
+    if not dry_run:
+        db_manager.save_profile_scores(profile_rows, db)
+
+    return {
+        'total': total,
+        'changed': len(changes['id']),
+        'up': sum(1 for d in deltas if d > 0),
+        'down': sum(1 for d in deltas if d < 0),
+        'mean_delta': round(sum(deltas) / len(deltas), 1) if deltas else 0,
+        'transitions': transitions,
+        'best_profiles': best_profiles,
+        'sec': round(time.monotonic() - start, 2),
+    }
+
+
+def print_report(report: dict, dry_run: bool = False):
+    note = " (dry run - nothing written)" if dry_run else ""
+    print(f"🔁 Rescored {report['total']} offers in {report['sec']}s{note}")
+    print(f"   Score changed: {report['changed']} (↑ {report['up']} / ↓ {report['down']}, mean Δ {report['mean_delta']})")
+    if report['transitions']:
+        rows = [[old, new, n] for (old, new), n in report['transitions'].most_common()]
+        print(tabulate(rows, headers=['Old status', 'New status', 'Offers']))
+    if report['best_profiles']:
+        rows = [[profile, n] for profile, n in report['best_profiles'].most_common()]
+        print(tabulate(rows, headers=['Best profile', 'Offers']))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--db', default='scan_cache', help='Database to rescore (main or scan_cache)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all cores, 0 = in-process)')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Offers per Arrow batch')
+    parser.add_argument('--dry-run', action='store_true', help='Only report changes')
+    args = parser.parse_args()
+
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    report = rescore(load_profiles(config), args.db, args.workers, args.batch_size, args.dry_run)
+    print_report(report, args.dry_run)
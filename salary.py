@@ -0,0 +1,126 @@
+"""
+Normalizacja wynagrodzeń
+
+Jedna reguła dla wszystkich źródeł: tekst z Pracuj.pl ("12 000–18 000 zł brutto / mies.")
+i pola JobSpy (min_amount / max_amount / interval / currency) zamieniane na:
+salary_min, salary_max, salary_currency, salary_period, salary_monthly_pln.
+Te same klucze są kolumnami tabeli offers.
+"""
+
+import math
+import re
+
+# Kursy do PLN (przybliżone - wystarczą do progu min_salary_pln)
+PLN_RATES = {'PLN': 1.0, 'EUR': 4.3, 'USD': 4.0, 'GBP': 5.0, 'CHF': 4.5}
+
+# Mnożnik okresu -> miesiąc (160h / 21 dni roboczych w miesiącu)
+PERIOD_TO_MONTHLY = {'month': 1.0, 'year': 1 / 12, 'week': 4.33, 'day': 21.0, 'hour': 160.0}
+
+JOBSPY_INTERVALS = {'yearly': 'year', 'monthly': 'month', 'weekly': 'week', 'daily': 'day', 'hourly': 'hour'}
+
+PERIOD_MARKERS = [
+    ('hour', ['godz', 'hour', '/h', 'hourly']),
+    ('day', ['dzień', 'dzien', 'dniówk', 'day', 'daily']),
+    ('year', ['rok', 'rocznie', 'year', 'annual']),
+    ('week', ['tydz', 'week']),
+]
+
+CURRENCY_MARKERS = [
+    ('PLN', ['zł', 'pln']),
+    ('EUR', ['eur', '€']),
+    ('USD', ['usd', '$']),
+    ('GBP', ['gbp', '£']),
+    ('CHF', ['chf']),
+]
+
+NUMBER_RE = re.compile(r'\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?')
+
+EMPTY = {
+    'salary_min': None,
+    'salary_max': None,
+    'salary_currency': None,
+    'salary_period': None,
+    'salary_monthly_pln': 0,
+}
+
+
+def _to_float(raw: str) -> float:
+    return float(re.sub(r'[ \u00a0\u202f]', '', raw).replace(',', '.'))
+
+
+def _missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value)) or value == 0
+
+
+def monthly_factor(period: str, currency: str) -> float:
+    """Mnożnik kwota -> miesięczne PLN"""
+    return PERIOD_TO_MONTHLY.get(period, 1.0) * PLN_RATES.get(currency, 1.0)
+
+
+def monthly_pln(amount, period: str, currency: str) -> int:
+    """Kwota -> miesięczne PLN (0 gdy brak kwoty)"""
+    if _missing(amount):
+        return 0
+    # round() chroni przed 39999.999... przy okresach typu 1/12
+    return int(round(amount * monthly_factor(period, currency), 2))
+
+
+def _normalized(low, high, currency: str, period: str) -> dict:
+    if _missing(low) and _missing(high):
+        return dict(EMPTY)
+    low = None if _missing(low) else float(low)
+    high = None if _missing(high) else float(high)
+    # "Od" widełek - tak jak wszystkie wcześniejsze extract_salary*
+    return {
+        'salary_min': low,
+        'salary_max': high,
+        'salary_currency': currency,
+        'salary_period': period,
+        'salary_monthly_pln': monthly_pln(low if low is not None else high, period, currency),
+    }
+
+
+def parse_salary_text(text: str) -> dict:
+    """Widełki z tekstu ogłoszenia ("Nie podano" / pusty = brak)"""
+    if not text or "Nie podano" in str(text):
+        return dict(EMPTY)
+    text = str(text)
+    lower = text.lower()
+
+    numbers = [_to_float(n) for n in NUMBER_RE.findall(text)]
+    if not numbers:
+        return dict(EMPTY)
+
+    period = next((p for p, markers in PERIOD_MARKERS if any(m in lower for m in markers)), 'month')
+    currency = next((c for c, markers in CURRENCY_MARKERS if any(m in lower for m in markers)), 'PLN')
+    return _normalized(numbers[0], numbers[1] if len(numbers) > 1 else None, currency, period)
+
+
+def parse_salary_fields(min_amount, max_amount, interval, currency=None) -> dict:
+    """
+    Pola z JobSpy. Bez waluty zostaje założenie z job_hunter_v2:
+    kwoty roczne w USD, pozostałe w PLN.
+    """
+    period, currency = jobspy_period_currency(interval, currency)
+    return _normalized(min_amount, max_amount, currency, period)
+
+
+def jobspy_period_currency(interval, currency=None) -> tuple:
+    """(okres, waluta) dla interval/currency z JobSpy"""
+    interval = interval.lower() if isinstance(interval, str) else ''
+    period = JOBSPY_INTERVALS.get(interval, 'month')
+    if not isinstance(currency, str) or not currency:
+        currency = 'USD' if period == 'year' else 'PLN'
+    return period, currency.upper()
+
+
+def format_salary(fields: dict) -> str:
+    """
+    Znormalizowane widełki jako tekst ("20000–30000 EUR / year") - dla źródeł z polami
+    zamiast tekstu; parse_salary_text daje z niego tę samą kwotę miesięczną
+    """
+    if not fields.get('salary_period'):
+        return ''
+    amounts = [a for a in (fields['salary_min'], fields['salary_max']) if a is not None]
+    text = "–".join(str(int(a)) if a == int(a) else str(a) for a in amounts)
+    return f"{text} {fields['salary_currency']} / {fields['salary_period']}"
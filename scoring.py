@@ -0,0 +1,137 @@
+"""
+Scoring dopasowania oferty do CV (sekcja profiles z config.yaml)
+
+Wspólny dla job_hunter_v3 (oferty z sieci) i rescore.py (oferty z bazy) - bez
+zależności od scrapera, więc ładuje się szybko również w procesach puli.
+"""
+
+import ast
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher
+from text_norm import fold, normalized
+
+# (próg, werdykt, status) - od najwyższego; poniżej ostatniego progu REJECT
+VERDICTS = [
+    (85, "🔥 MUST APPLY", "Lead"),
+    (70, "✅ STRONG MATCH", "Lead"),
+    (50, "⚠️ MAYBE", "poczekalnia"),
+]
+REJECT = ("❌ REJECT", "Rejected")
+
+# Statusy nadawane przez scoring (inne - np. ręcznie ustawione - rescore zostawia)
+SCORED_STATUSES = {status for _, _, status in VERDICTS} | {REJECT[1]}
+
+FULL_TEXT_FIELDS = [('title', 'TITLE'), ('description', 'DESCRIPTION'),
+                    ('responsibilities', 'RESPONSIBILITIES'), ('requirements', 'REQUIREMENTS')]
+MATCH_FIELDS = tuple(key for key, _ in FULL_TEXT_FIELDS)
+
+
+def offer_full_text(details: dict) -> str:
+    """Treść oferty zapisywana w offers.full_text"""
+    return "\n".join(f"{label}: {details.get(key)}" for key, label in FULL_TEXT_FIELDS)
+
+
+def parse_full_text(full_text: str) -> dict:
+    """Odwrotność offer_full_text: szczegóły oferty z offers.full_text (listy z repr przez literal_eval)"""
+    details = {}
+    rest = full_text or ''
+    # Od końca - opis może zawierać dowolny tekst, etykiety kolejnych pól są zawsze po nim
+    for key, label in reversed(FULL_TEXT_FIELDS[1:]):
+        head, sep, value = rest.rpartition(f"\n{label}: ")
+        if not sep:
+            continue
+        rest = head
+        if key in ('responsibilities', 'requirements'):
+            try:
+                value = ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                value = [value]
+        details[key] = value
+    details['title'] = rest[len("TITLE: "):] if rest.startswith("TITLE: ") else rest
+    return details
+
+
+def details_text(details: dict) -> str:
+    """Tekst oferty do dopasowania słów kluczowych (text_norm.fold; zapamiętany w NormalizedOffer)"""
+    return normalized(details).folded(*MATCH_FIELDS)
+
+
+def verdict(score: int) -> tuple:
+    """(werdykt, status) dla wyniku"""
+    for threshold, label, status in VERDICTS:
+        if score >= threshold:
+            return label, status
+    return REJECT
+
+
+def load_profiles(config: dict) -> dict:
+    """Profile scoringu z config.yaml: sekcja `profiles` albo (starszy config) samo scoring_weights"""
+    return config.get('profiles') or {'default': config['scoring_weights']}
+
+
+class ProfileScorer:
+    """
+    Scoring względem wszystkich profili naraz: {profil: {kategoria: {weight, keywords}}}.
+    Tekst przeszukiwany raz (jeden automat na słowa ze wszystkich profili) -> wektor trafień;
+    słowa i tekst porównywane po text_norm.fold (bez wielkości liter i polskich znaków);
+    wynik każdej kategorii każdego profilu to jedno mnożenie przez macierz słowo × (profil, kategoria):
+      kategoria = min(0.4·weight za każde z 2 pierwszych słów + 10 za dowolne z pozostałych, weight)
+      profil = suma kategorii; offers.score/status = najlepszy profil
+    """
+
+    def __init__(self, profiles: dict):
+        self.profiles = list(profiles)
+        # Słowa po fold(); warianty z/bez polskich znaków w jednej kategorii liczą się raz
+        self.columns = [
+            (p, cat, {'weight': cfg['weight'], 'keywords': list(dict.fromkeys(fold(kw) for kw in cfg['keywords']))})
+            for p, cats in profiles.items() for cat, cfg in cats.items()
+        ]
+        self.keywords = sorted({kw for _, _, cfg in self.columns for kw in cfg['keywords']})
+        self.matcher = KeywordMatcher(self.keywords)
+        kw_index = {kw: i for i, kw in enumerate(self.keywords)}
+
+        shape = (len(self.keywords), len(self.columns))
+        self.primary = np.zeros(shape)   # 0.4·weight za trafienie w 2 pierwszych słowach
+        self.secondary = np.zeros(shape)  # 1 = słowo bonusowe kategorii
+        self.caps = np.array([cfg['weight'] for _, _, cfg in self.columns], dtype=float)
+        self.membership = np.zeros((len(self.columns), len(self.profiles)))
+        for c, (profile, _, cfg) in enumerate(self.columns):
+            for kw in cfg['keywords'][:2]:
+                self.primary[kw_index[kw], c] += cfg['weight'] * 0.4
+            for kw in cfg['keywords'][2:]:
+                self.secondary[kw_index[kw], c] = 1
+            self.membership[c, self.profiles.index(profile)] = 1
+        self._kw_index = kw_index
+
+    def hits(self, texts: list) -> np.ndarray:
+        """Macierz trafień (oferty × słowa) dla tekstów już po fold()"""
+        h = np.zeros((len(texts), len(self.keywords)))
+        for row, text in enumerate(texts):
+            for kw in self.matcher.find(text):
+                h[row, self._kw_index[kw]] = 1
+        return h
+
+    def category_scores(self, h: np.ndarray) -> np.ndarray:
+        """(oferty × kolumny profil/kategoria)"""
+        bonus = 10.0 * (h @ self.secondary > 0)
+        return np.minimum(h @ self.primary + bonus, self.caps)
+
+    def score_many(self, texts: list) -> np.ndarray:
+        """Wyniki (oferty × profile) jako int"""
+        return (self.category_scores(self.hits(texts)) @ self.membership).astype(int)
+
+    def score_text(self, text: str) -> tuple:
+        """(najlepszy wynik, {profil: wynik}) dla tekstu już po fold()"""
+        scores = dict(zip(self.profiles, self.score_many([text])[0].tolist()))
+        return max(scores.values()), scores
+
+    def match(self, details: dict) -> dict:
+        cats = self.category_scores(self.hits([details_text(details)]))[0]
+        scores = dict(zip(self.profiles, (cats @ self.membership).astype(int).tolist()))
+        best = max(self.profiles, key=lambda p: scores[p])
+        breakdown = {cat: int(cats[c]) for c, (p, cat, _) in enumerate(self.columns) if p == best}
+        label, status = verdict(scores[best])
+        return {'score': scores[best], 'breakdown': breakdown, 'verdict': label, 'status': status,
+                'profile': best, 'profiles': scores}
@@ -0,0 +1,186 @@
+"""
+Źródła ofert dla job_hunter_v3
+
+Każde źródło (adapter) oddaje oferty w formacie listy Pracuj.pl:
+Title, Company, Location, Link, Salary (+ Source). Źródła, które od razu mają pełną
+treść ogłoszenia (JobSpy), dokładają gotowe Details i SalaryFields - etap szczegółów
+nie robi dla nich requestu.
+Źródła async działają na pętli zdarzeń, blokujące - w wątkach (run_in_executor).
+Wszystkie piszą do wspólnego SourceContext: dedup po Link i jedna kolejka do pre-filtra.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Pracuj_pl_Scraper.scraper import PracujScraper
+from http_client import ThrottledSession
+from salary import parse_salary_fields, format_salary
+from text_norm import field_text
+
+
+class SourceContext:
+    """Wspólny stan runu dla wszystkich źródeł"""
+
+    def __init__(self, out_q: asyncio.Queue, known_urls: set):
+        self.out_q = out_q
+        self.known_urls = known_urls
+        self.seen = set()
+
+    async def emit(self, offer: dict) -> bool:
+        """Oferta do pipeline'u, o ile jej Link nie pojawił się wcześniej w tym runie"""
+        if offer['Link'] in self.seen:
+            return False
+        self.seen.add(offer['Link'])
+        await self.out_q.put(offer)
+        return True
+
+
+# ===== PRACUJ.PL (ASYNC) =====
+
+class PracujSource:
+    name = 'pracuj'
+
+    def __init__(self, client: ThrottledSession, queries: list, max_pages: int, min_new_share: float):
+        self.client = client
+        self.queries = queries
+        self.max_pages = max_pages
+        self.min_new_share = min_new_share
+        self.scraper = PracujScraper()
+        self.pages_saved = 0
+
+    async def scrape_query(self, ctx: SourceContext, keyword: str) -> tuple:
+        """
+        Paginacja strona po stronie: scrape_keyword z max_pages=1..N (wcześniejsze strony
+        idą z pamięci ThrottledSession.for_query, więc każda strona to jeden request;
+        pamięć znika razem z zapytaniem).
+        Stop, gdy udział nowych linków na stronie (spoza runu i spoza bazy)
+        spada poniżej min_new_share albo strona jest pusta.
+        Zwraca (liczba ofert zapytania, liczba pobranych stron).
+        """
+        client = self.client.for_query()
+        links = set()
+        for page in range(1, self.max_pages + 1):
+            res = await self.scraper.scrape_keyword(client, keyword, max_pages=page) or []
+            page_links = {o['Link'] for o in res} - links
+            links |= page_links
+
+            new_links = page_links - ctx.seen - ctx.known_urls
+            for o in res:
+                await ctx.emit({**o, 'Source': self.name})
+            if not page_links or len(new_links) / len(page_links) < self.min_new_share:
+                break
+        return len(links), page
+
+    async def run(self, ctx: SourceContext) -> dict:
+        """Wszystkie zapytania równolegle; tempo trzyma wspólny limiter i limit na host w ThrottledSession"""
+        errors = 0
+
+        async def one(q):
+            nonlocal errors
+            try:
+                count, pages = await self.scrape_query(ctx, q['keyword'])
+            except Exception as e:
+                errors += 1
+                print(f"   ❌ {q['description']}: {e}")
+                return
+            stop_note = " (stopped early: few new offers)" if pages < self.max_pages else ""
+            print(f"   📡 {q['description']}: {count} offers, {pages}/{self.max_pages} pages{stop_note}")
+            self.pages_saved += self.max_pages - pages
+
+        await asyncio.gather(*(one(q) for q in self.queries))
+        return {'calls': len(self.queries), 'errors': errors}
+
+
+# ===== JOBSPY (BLOKUJĄCE, WĄTKI) =====
+
+def jobspy_offer(row: dict, site: str) -> dict:
+    """Wiersz scrape_jobs -> oferta w formacie listy, z gotowymi szczegółami"""
+    fields = parse_salary_fields(row.get('min_amount'), row.get('max_amount'), row.get('interval'), row.get('currency'))
+    salary = format_salary(fields)
+    location = field_text(row.get('location'))
+    # Praca zdalna przechodzi filtr lokalizacji tak jak w job_hunter_v2
+    if row.get('is_remote') is True:
+        location = f"{location} (remote)".strip()
+    details = {
+        'title': field_text(row.get('title')),
+        'company': field_text(row.get('company')) or 'Unknown',
+        'location': location,
+        'url': row['job_url'],
+        'salary': salary,
+        'description': field_text(row.get('description')),
+        'responsibilities': [],
+        'requirements': [],
+    }
+    return {
+        'Title': details['title'],
+        'Company': details['company'],
+        'Location': location,
+        'Link': row['job_url'],
+        'Salary': salary,
+        'Source': f"jobspy:{site}",
+        'Details': details,
+        'SalaryFields': fields,
+    }
+
+
+class JobSpySource:
+    name = 'jobspy'
+
+    def __init__(self, cfg: dict):
+        self.sites = cfg['sites']
+        self.combos = [(term, loc, site) for term in cfg['search_terms'] for loc in cfg['locations'] for site in self.sites]
+        self.workers = cfg.get('workers', 4)
+        self.site_concurrency = cfg.get('site_concurrency', {})
+        self.params = {
+            'results_wanted': cfg.get('results_wanted', 50),
+            'is_remote': cfg.get('is_remote', True),
+            'country_indeed': cfg.get('country_indeed', 'Poland'),
+        }
+
+    def _call(self, term: str, location: str, site: str, site_slots: dict) -> tuple:
+        """Jedno blokujące wywołanie scrape_jobs (w wątku); (DataFrame albo None, czas w s)"""
+        from jobspy import scrape_jobs  # opcjonalna zależność - tylko gdy źródło włączone
+
+        with site_slots[site]:
+            start = time.monotonic()
+            jobs = scrape_jobs(site_name=[site], search_term=term, location=location, **self.params)
+            return jobs, time.monotonic() - start
+
+    async def run(self, ctx: SourceContext) -> dict:
+        loop = asyncio.get_running_loop()
+        site_slots = {site: threading.Semaphore(self.site_concurrency.get(site, 2)) for site in self.sites}
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        errors = 0
+
+        async def one(term, loc, site):
+            nonlocal errors
+            try:
+                jobs, sec = await loop.run_in_executor(pool, self._call, term, loc, site, site_slots)
+            except Exception as e:
+                errors += 1
+                print(f"   ❌ jobspy '{term}' @ '{loc}' [{site}]: {e}")
+                return
+            rows = jobs.to_dict('records') if jobs is not None else []
+            new = 0
+            for row in rows:
+                if field_text(row.get('job_url')):
+                    new += await ctx.emit(jobspy_offer(row, site))
+            print(f"   📡 jobspy '{term}' @ '{loc}' [{site}]: {len(rows)} offers, {new} new ({sec:.1f}s)")
+
+        try:
+            await asyncio.gather(*(one(*combo) for combo in self.combos))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return {'calls': len(self.combos), 'errors': errors}
+
+
+def build_sources(sources_cfg: dict, client: ThrottledSession, search_queries: list, settings: dict) -> list:
+    """Włączone źródła z sekcji `sources` config.yaml"""
+    sources = []
+    if sources_cfg.get('pracuj', {}).get('enabled', True):
+        sources.append(PracujSource(client, search_queries, settings['max_pages_per_query'], settings['list_min_new_share']))
+    if sources_cfg.get('jobspy', {}).get('enabled', False):
+        sources.append(JobSpySource(sources_cfg['jobspy']))
+    return sources
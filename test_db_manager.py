@@ -0,0 +1,58 @@
+"""
+Testy zapisu ofert (db_manager.add_offers_bulk) na tymczasowej bazie
+
+    python -m pytest test_db_manager.py -q
+"""
+
+import pandas as pd
+import pytest
+
+import db_manager
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Osobna baza w katalogu tymczasowym (db_manager szuka plików w BASE_DIR)"""
+    monkeypatch.setattr(db_manager, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(db_manager, '_COMPANY_IDS', {})
+    yield 'test_offers'
+    db_manager.close_all()
+
+
+def _offers(db):
+    with db_manager.get_conn(db) as conn:
+        return conn.execute("""
+            SELECT o.source_url, c.name, o.title, o.status, o.score, o.salary_min, o.salary_max, o.salary_period
+            FROM offers o JOIN companies c ON o.company_id = c.id ORDER BY o.source_url
+        """).fetchall()
+
+
+def test_dataframe_with_nan_uses_defaults(db):
+    """NaN z DataFrame (JobSpy) = brak wartości: firma 'Unknown', score 0, status 'New', bez pensji"""
+    frame = pd.DataFrame([
+        {'company': 'ACME', 'title': 'Dyrektor zakupów', 'location': 'Warszawa', 'url': 'https://a/1',
+         'status': 'New', 'full_text': 'tekst', 'score': 55, 'salary': '12 000 - 18 000 zł'},
+        {'company': float('nan'), 'title': 'Kupiec', 'location': float('nan'), 'url': 'https://a/2',
+         'status': float('nan'), 'full_text': float('nan'), 'score': float('nan'), 'salary': float('nan')},
+    ])
+    assert db_manager.add_offers_bulk(frame, db=db) == 2
+    assert _offers(db) == [
+        ('https://a/1', 'ACME', 'Dyrektor zakupów', 'New', 55, 12000.0, 18000.0, 'month'),
+        ('https://a/2', 'Unknown', 'Kupiec', 'New', 0, None, None, None),
+    ]
+
+
+def test_add_offer_with_nan_company(db):
+    """job_hunter_v2 przekazuje do add_offer komórki wiersza JobSpy wprost"""
+    db_manager.add_offer(float('nan'), 'Kupiec', 'Kraków', 'https://a/3', score=float('nan'), db=db)
+    assert _offers(db) == [('https://a/3', 'Unknown', 'Kupiec', 'New', 0, None, None, None)]
+
+
+def test_resave_replaces_salary_as_a_whole(db):
+    """Nowe widełki zastępują stare w całości; zapis bez pensji zostawia znaną"""
+    offer = {'company': 'ACME', 'title': 'Kupiec', 'location': 'Warszawa', 'url': 'https://a/4', 'score': 40}
+    db_manager.add_offers_bulk([{**offer, 'salary': '12 000 - 18 000 zł'}], db=db)
+    db_manager.add_offers_bulk([{**offer, 'salary': '15 000 zł'}], db=db)
+    assert _offers(db)[0][5:] == (15000.0, None, 'month')
+    db_manager.add_offers_bulk([{**offer, 'salary': None}], db=db)
+    assert _offers(db)[0][5:] == (15000.0, None, 'month')
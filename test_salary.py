@@ -0,0 +1,66 @@
+"""
+Testy normalizacji wynagrodzeń (salary.py) i kolumnowej pensji w job_hunter_v2.score_jobs_frame
+
+    python -m pytest test_salary.py -q
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from salary import EMPTY, format_salary, parse_salary_fields, parse_salary_text
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("12 000–18 000 zł brutto / mies.", (12000.0, 18000.0, 'PLN', 'month', 12000)),
+    ("15 000 zł", (15000.0, None, 'PLN', 'month', 15000)),
+    ("8 500,50 PLN", (8500.5, None, 'PLN', 'month', 8500)),
+    ("100-120 zł / godz.", (100.0, 120.0, 'PLN', 'hour', 16000)),
+    ("20 000 - 30 000 EUR rocznie", (20000.0, 30000.0, 'EUR', 'year', 7166)),
+    ("$5000 / month", (5000.0, None, 'USD', 'month', 20000)),
+])
+def test_parse_salary_text(text, expected):
+    assert tuple(parse_salary_text(text).values()) == expected
+
+
+@pytest.mark.parametrize('text', ["Nie podano", "", None, float('nan'), "do negocjacji"])
+def test_parse_salary_text_without_salary(text):
+    assert parse_salary_text(text) == EMPTY
+
+
+def test_parse_salary_fields_missing_values():
+    """NaN z JobSpy = brak: kwota z drugiego końca widełek, waluta z założenia v2 (roczne = USD)"""
+    assert parse_salary_fields(np.nan, 120000, 'yearly', np.nan) == {
+        'salary_min': None, 'salary_max': 120000.0, 'salary_currency': 'USD',
+        'salary_period': 'year', 'salary_monthly_pln': 40000,
+    }
+    assert parse_salary_fields(None, np.nan, np.nan, None) == EMPTY
+
+
+def test_format_salary_round_trip():
+    """Tekst z format_salary parsuje się z powrotem do tych samych pól"""
+    fields = parse_salary_fields(20000, 30000, 'yearly', 'EUR')
+    assert parse_salary_text(format_salary(fields)) == fields
+    assert format_salary(dict(EMPTY)) == ''
+
+
+def test_frame_salary_matches_rows():
+    """score_jobs_frame: salary_pln == extract_salary_pln wiersza, także przy brakującym interval / currency"""
+    pytest.importorskip('jobspy')  # job_hunter_v2 importuje JobSpy przy starcie
+    import job_hunter_v2 as v2
+
+    rng = random.Random(13)
+    missing = [None, np.nan]
+    df = pd.DataFrame([{
+        'min_amount': rng.choice(missing + [0, 9000, 15000, 80000]),
+        'max_amount': rng.choice(missing + [12000, 25000, 150000]),
+        'interval': rng.choice(missing + ['yearly', 'monthly', 'hourly', 'daily']),
+        'currency': rng.choice(missing + ['PLN', 'EUR', 'USD']),
+    } for _ in range(2000)])
+    frame = v2.score_jobs_frame(df)
+    for i, row in enumerate(df.to_dict('records')):
+        assert frame.loc[i, 'salary_pln'] == v2.extract_salary_pln(row), (i, row)
+    assert list(v2.score_jobs_frame(df.drop(columns=['interval', 'currency']))['salary_pln'][:50]) == \
+        [v2.extract_salary_pln({**r, 'interval': None, 'currency': None}) for r in df.to_dict('records')[:50]]
@@ -0,0 +1,71 @@
+"""
+Testy scoringu job_hunter_v2: score_jobs_frame (kolumnowo) == check_* / calculate_cv_match (wiersz po wierszu)
+
+    python -m pytest test_scoring.py -q
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('jobspy')  # job_hunter_v2 importuje JobSpy przy starcie
+
+import job_hunter_v2 as v2
+
+TEXT_COLUMNS = ('title', 'description', 'company', 'location', 'city', 'state')
+
+
+def _random_jobs(n: int, seed: int = 7) -> pd.DataFrame:
+    """Wiersze jak z scrape_jobs: słowa kluczowe z konfiguracji v2, polskie znaki, puste komórki (None / NaN)"""
+    rng = random.Random(seed)
+    words = ([kw for _, kws, *_ in v2.SCORING_CATEGORIES for kw in kws] + v2.LOCATION_KEYWORDS
+             + v2.REQUIRED_LEVELS + v2.EXCLUDED_TITLES + ["zarzadzanie zespolem", "spozywcze", "Łódź", "x"])
+
+    def cell():
+        r = rng.random()
+        return None if r < 0.15 else (np.nan if r < 0.3 else " ".join(rng.sample(words, rng.randint(1, 6))))
+
+    return pd.DataFrame([{c: cell() for c in TEXT_COLUMNS} | {'is_remote': rng.random() < 0.1} for _ in range(n)])
+
+
+def _assert_frame_matches_rows(df: pd.DataFrame):
+    frame = v2.score_jobs_frame(df)
+    for i, row in enumerate(df.to_dict('records')):
+        match = v2.calculate_cv_match(row)
+        assert frame.loc[i, 'score'] == match['score'], (i, row)
+        assert frame.loc[i, 'status'] == match['status'], (i, row)
+        assert frame.loc[i, 'location_ok'] == v2.check_location(row), (i, row)
+        assert frame.loc[i, 'level_ok'] == v2.check_position_level(row['title']), (i, row)
+
+
+def test_frame_matches_rows_with_missing_cells():
+    df = _random_jobs(3000)
+    assert df[list(TEXT_COLUMNS)].isna().any(axis=1).sum() > 1000
+    _assert_frame_matches_rows(df)
+
+
+def test_missing_description_does_not_zero_the_score():
+    """NaN w jednej kolumnie nie może wyzerować tekstu całego wiersza"""
+    df = pd.DataFrame([
+        {'title': 'Head of Category Management', 'description': np.nan, 'company': 'FMCG retail',
+         'location': 'Warszawa', 'city': None, 'state': np.nan, 'is_remote': False},
+    ])
+    assert v2.score_jobs_frame(df).loc[0, 'score'] == v2.calculate_cv_match(df.iloc[0].to_dict())['score'] > 0
+    _assert_frame_matches_rows(df)
+
+
+def test_missing_location_cells_match_row_functions():
+    """city=None / NaN: ani wiersz, ani kolumna nie traktują braku jako tekstu 'none' / 'nan'"""
+    df = pd.DataFrame([
+        {'title': 'Dyrektor Sprzedaży', 'description': 'FMCG', 'company': 'ACME',
+         'location': 'Warszawa', 'city': None, 'state': np.nan, 'is_remote': False},
+        {'title': np.nan, 'description': None, 'company': np.nan,
+         'location': np.nan, 'city': 'Kraków', 'state': None, 'is_remote': False},
+        {'title': 'Head of Sales', 'description': np.nan, 'company': None,
+         'location': None, 'city': np.nan, 'state': 'Polska', 'is_remote': False},
+    ])
+    frame = v2.score_jobs_frame(df)
+    assert list(frame['location_ok']) == [True, False, True]
+    _assert_frame_matches_rows(df)
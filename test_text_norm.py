@@ -0,0 +1,38 @@
+"""
+Testy normalizacji tekstu (text_norm) - wspólnej dla pre-filtra, scoringu i TF-IDF
+
+    python -m pytest test_text_norm.py -q
+"""
+
+import numpy as np
+
+from text_norm import field_text, fold, normalized
+
+
+def test_fold_strips_polish_diacritics():
+    assert fold("Zarządzanie Zespołem, ŁÓDŹ") == "zarzadzanie zespolem, lodz"
+    assert fold(None) == ""
+
+
+def test_field_text_missing_values_are_empty():
+    """None i NaN z DataFrame (JobSpy) to pusty tekst, nie 'None' / 'nan'"""
+    assert field_text(None) == ""
+    assert field_text(float('nan')) == ""
+    assert field_text(np.nan) == ""
+    assert field_text(np.float64('nan')) == ""
+    assert field_text(["Negocjacje", "Excel"]) == "Negocjacje Excel"
+    assert field_text(12000) == "12000"
+
+
+def test_normalized_offer_skips_missing_fields():
+    offer = normalized({'title': 'Dyrektor Zakupów', 'description': np.nan, 'company': None})
+    assert offer.folded('title', 'description', 'company') == "dyrektor zakupow  "
+    assert offer.tokens('title', 'description', 'company') == ["dyrektor", "zakupow"]
+    assert 'nan' not in offer.folded('description')
+
+
+def test_normalized_offer_forgets_memo_on_change():
+    offer = normalized({'title': 'Kupiec'})
+    assert offer.folded('title') == "kupiec"
+    offer['title'] = 'Dyrektor Handlowy'
+    assert offer.folded('title') == "dyrektor handlowy"
@@ -0,0 +1,75 @@
+"""
+Normalizacja tekstu ofert - liczona raz na ofertę, wspólna dla filtrów i scoringu
+
+fold(): lower-case + zdjęte znaki diakrytyczne ("Zarządzanie" -> "zarzadzanie"), więc słowa
+kluczowe z config.yaml trafiają niezależnie od tego, czy ogłoszenie ma polskie znaki.
+NormalizedOffer to zwykły dict oferty, który zapamiętuje formy lower / folded / tokens
+dla zestawu pól - kolejne etapy (pre-filtr, pre-score, scoring) nie sklejają tekstu od nowa.
+Słowa kluczowe porównywane z folded() muszą przejść przez fold() (robią to PreFilter i ProfileScorer).
+"""
+
+import math
+import re
+import unicodedata
+
+TOKEN_RE = re.compile(r'[^\W\d_]{2,}')
+
+
+def _fold_table() -> dict:
+    """Litery łacińskie z diakrytykami (U+00C0-U+017F) -> litera bazowa; ł/Ł nie rozkłada się w NFKD"""
+    table = {ord('ł'): 'l', ord('Ł'): 'L'}
+    for code in range(0xC0, 0x180):
+        base = unicodedata.normalize('NFKD', chr(code)).encode('ascii', 'ignore').decode()
+        if base and base != chr(code):
+            table[code] = base
+    return table
+
+
+_FOLD = _fold_table()
+
+
+def fold(text: str) -> str:
+    """Lower-case bez polskich (i innych łacińskich) znaków diakrytycznych"""
+    text = (text or '').lower()
+    return text if text.isascii() else text.translate(_FOLD)
+
+
+def field_text(value) -> str:
+    """Wartość pola jako tekst: lista (responsibilities/requirements) sklejona spacjami, None/NaN (pandas) = pusty"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return str(value)
+
+
+class NormalizedOffer(dict):
+    """Dict oferty z pamięcią znormalizowanych form tekstu (klucz = rodzaj + pola); zmiana pola czyści pamięć"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._memo = {}
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._memo.clear()
+
+    def _cached(self, kind: str, fields: tuple, build):
+        key = (kind, fields)
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+    def lower(self, *fields) -> str:
+        return self._cached('lower', fields, lambda: " ".join(field_text(self.get(f)) for f in fields).lower())
+
+    def folded(self, *fields) -> str:
+        return self._cached('folded', fields, lambda: fold(self.lower(*fields)))
+
+    def tokens(self, *fields) -> list:
+        return self._cached('tokens', fields, lambda: TOKEN_RE.findall(self.folded(*fields)))
+
+
+def normalized(offer: dict) -> NormalizedOffer:
+    """Ta sama oferta jako NormalizedOffer (bez kopiowania, jeśli już nią jest)"""
+    return offer if isinstance(offer, NormalizedOffer) else NormalizedOffer(offer)
@@ -0,0 +1,180 @@
+"""
+Podobieństwo TF-IDF ofert do CV (drugi silnik scoringu, obok słów kluczowych)
+
+Słowa kluczowe dają grube progi i dużo remisów; TF-IDF patrzy na całą treść.
+Słownik i DF (w ilu ofertach występuje słowo) liczone z offers.full_text i trzymane w bazie
+(tfidf_vocab / tfidf_meta, migracja 7) - każdy run dolicza tylko oferty dodane od poprzedniego.
+CV = pliki tekstowe z CV Moje/_pliki_Bazowe (settings.tfidf_cv_dir). Oferty i CV to rzadkie
+wektory (sublinear TF × IDF, norma L2); podobieństwo paczki ofert do wszystkich plików CV
+to jedno mnożenie macierzy rzadkich, wynik = najlepszy plik.
+
+    python tfidf.py --db scan_cache --top 20     # ranking zapisanych ofert
+    python tfidf.py --db scan_cache --save       # + odświeżenie offers.cv_similarity
+"""
+
+import argparse
+import math
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import yaml
+from scipy import sparse
+from tabulate import tabulate
+
+import db_manager
+from text_norm import TOKEN_RE, fold
+
+CV_SUFFIXES = ('.md', '.txt')
+
+
+def tokenize(text: str) -> list:
+    """Słowa (litery, min. 2 znaki) po text_norm.fold"""
+    return TOKEN_RE.findall(fold(text))
+
+
+class TfidfIndex:
+    """Słownik + DF jednej bazy; wektory dla tekstów spoza słownika pomijają nieznane słowa"""
+
+    def __init__(self, db: str = 'scan_cache'):
+        self.db = db
+        self.vocab = {}  # słowo -> (id kolumny, df)
+        self.n_docs = 0
+        self.max_offer_id = 0
+        self.cv = None   # macierz (pliki CV × słowa), wiersze znormalizowane
+        self.cv_files = []
+        self._load()
+
+    def _load(self):
+        with db_manager.get_conn(self.db) as conn:
+            self.vocab = {term: (term_id, df) for term, term_id, df in
+                          conn.execute("SELECT term, term_id, df FROM tfidf_vocab").fetchall()}
+            row = conn.execute("SELECT n_docs, max_offer_id FROM tfidf_meta WHERE id = 1").fetchone()
+        if row:
+            self.n_docs, self.max_offer_id = row
+        self._idf = None
+
+    def update(self, batch_size: int = 5000) -> int:
+        """Dolicza DF z ofert o id > max_offer_id (bez prawie-duplikatów); zwraca liczbę nowych ofert"""
+        changed = {}
+        added = 0
+        with db_manager.get_conn(self.db) as conn:
+            result = conn.execute("""
+                SELECT id, full_text FROM offers
+                WHERE id > ? AND full_text IS NOT NULL AND canonical_id IS NULL
+                ORDER BY id
+            """, (self.max_offer_id,))
+            while rows := result.fetchmany(batch_size):
+                for offer_id, full_text in rows:
+                    for term in set(tokenize(full_text)):
+                        term_id, df = self.vocab.get(term, (len(self.vocab), 0))
+                        self.vocab[term] = (term_id, df + 1)
+                        changed[term] = self.vocab[term]
+                    self.max_offer_id = offer_id
+                    added += 1
+        if not added:
+            return 0
+        self.n_docs += added
+        self._idf = None
+        with db_manager.get_conn(self.db) as conn:
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                terms = list(changed)
+                conn.execute("""
+                    INSERT OR REPLACE INTO tfidf_vocab
+                    SELECT unnest(?::VARCHAR[]), unnest(?::INTEGER[]), unnest(?::INTEGER[])
+                """, (terms, [changed[t][0] for t in terms], [changed[t][1] for t in terms]))
+                conn.execute("INSERT OR REPLACE INTO tfidf_meta VALUES (1, ?, ?)", (self.n_docs, self.max_offer_id))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return added
+
+    @property
+    def idf(self) -> np.ndarray:
+        """Wygładzone IDF: log((1 + N) / (1 + df)) + 1"""
+        if self._idf is None:
+            self._idf = np.ones(len(self.vocab))
+            for term_id, df in self.vocab.values():
+                self._idf[term_id] = math.log((1 + self.n_docs) / (1 + df)) + 1
+        return self._idf
+
+    def vectorize(self, texts: list) -> sparse.csr_matrix:
+        """(teksty × słowa): (1 + log tf) · idf, wiersze z normą L2"""
+        idf = self.idf
+        data, indices, indptr = [], [], [0]
+        for text in texts:
+            row = {}
+            for term, tf in Counter(tokenize(text)).items():
+                entry = self.vocab.get(term)
+                if entry:
+                    row[entry[0]] = (1 + math.log(tf)) * idf[entry[0]]
+            norm = math.sqrt(sum(v * v for v in row.values())) or 1.0
+            indices.extend(row)
+            data.extend(v / norm for v in row.values())
+            indptr.append(len(indices))
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(texts), len(self.vocab)))
+
+    def load_cv(self, cv_dir: Path) -> int:
+        """Pliki CV (.md/.txt) jako wiersze macierzy cv; zwraca liczbę plików"""
+        files = sorted(p for p in Path(cv_dir).glob('*') if p.suffix.lower() in CV_SUFFIXES) if Path(cv_dir).is_dir() else []
+        self.cv_files = [p.name for p in files]
+        self.cv = self.vectorize([p.read_text(encoding='utf-8', errors='ignore') for p in files]) if files else None
+        return len(files)
+
+    def similarity(self, texts: list) -> np.ndarray:
+        """Kosinus (0-1) każdego tekstu do najbliższego pliku CV - jedno mnożenie na paczkę"""
+        if self.cv is None or not texts:
+            return np.zeros(len(texts))
+        return (self.vectorize(texts) @ self.cv.T).max(axis=1).toarray().ravel()
+
+
+def rank_offers(index: TfidfIndex, top: int = 20, batch_size: int = 5000, save: bool = False) -> list:
+    """
+    Top N zapisanych ofert wg podobieństwa do CV: [(id, firma, tytuł, score, podobieństwo %)].
+    save=True - zapisuje offers.cv_similarity wszystkich ofert (np. po zmianie plików CV).
+    """
+    best = []
+    sim_ids, sim_values = [], []
+    with db_manager.get_conn(index.db) as conn:
+        result = conn.execute("""
+            SELECT o.id, c.name, o.title, o.score, o.full_text FROM offers o
+            LEFT JOIN companies c ON o.company_id = c.id
+            WHERE o.full_text IS NOT NULL AND o.canonical_id IS NULL
+        """)
+        while rows := result.fetchmany(batch_size):
+            sims = [round(float(s) * 100, 1) for s in index.similarity([r[4] for r in rows])]
+            best.extend((r[0], r[1], r[2], r[3], s) for r, s in zip(rows, sims))
+            best = sorted(best, key=lambda r: r[4], reverse=True)[:top]
+            if save:
+                sim_ids.extend(r[0] for r in rows)
+                sim_values.extend(sims)
+        if sim_ids:
+            conn.execute("""
+                UPDATE offers SET cv_similarity = n.sim
+                FROM (SELECT unnest(?::INTEGER[]) AS id, unnest(?::DOUBLE[]) AS sim) n
+                WHERE offers.id = n.id
+            """, (sim_ids, sim_values))
+    return best
+
+
+if __name__ == "__main__":
+    base_dir = Path(__file__).parent
+    with open(base_dir / "config.yaml", 'r', encoding='utf-8') as f:
+        settings = yaml.safe_load(f)['settings']
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--db', default='scan_cache', help='Database name (main or scan_cache)')
+    parser.add_argument('--top', type=int, default=20, help='Number of offers to show')
+    parser.add_argument('--save', action='store_true', help='Store the similarity of every offer in offers.cv_similarity')
+    args = parser.parse_args()
+
+    index = TfidfIndex(args.db)
+    added = index.update()
+    n_cv = index.load_cv(base_dir / settings['tfidf_cv_dir'])
+    print(f"📚 Vocabulary: {len(index.vocab)} terms from {index.n_docs} offers (+{added} new) | CV files: {n_cv}")
+    if not n_cv:
+        print(f"❌ No .md/.txt CV files in {settings['tfidf_cv_dir']}")
+    else:
+        print(tabulate(rank_offers(index, args.top, save=args.save), headers=["ID", "Company", "Title", "Score", "CV sim %"]))